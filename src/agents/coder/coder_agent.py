@@ -14,14 +14,20 @@ Phase 2 (Implementation):
   - Returns complete file contents
 """
 
+import functools
+import io
 import json
+import os
 import re
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
 
 import anthropic
+import httpx
 
 from ..context.symbol_index import load_symbol_index, symbols_to_prompt
 
@@ -32,17 +38,99 @@ PHASE1_MODEL = "claude-3-5-haiku-20241022"
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 PROJECTS_DIR = PROJECT_ROOT / "games" / "projects"
 
-# Load developer agent instructions from markdown file
+# Developer agent instructions, loaded from markdown on first use
 DEV_AGENT_PATH = PROJECT_ROOT / "docs" / "DEV_AGENT.md"
-DEV_AGENT_INSTRUCTIONS = ""
-if DEV_AGENT_PATH.exists():
-    DEV_AGENT_INSTRUCTIONS = DEV_AGENT_PATH.read_text()
-else:
-    # Fallback minimal instructions if file missing
-    DEV_AGENT_INSTRUCTIONS = """You are a GBDK-2020 GameBoy developer.
+
+# Fallback minimal instructions if file missing
+DEV_AGENT_FALLBACK = """You are a GBDK-2020 GameBoy developer.
 Output ONLY a JSON code block with complete file contents.
 No explanatory text before or after the JSON."""
 
+
+@functools.cache
+def get_dev_agent_instructions() -> str:
+    """Load docs/DEV_AGENT.md once, falling back to minimal instructions."""
+    try:
+        return DEV_AGENT_PATH.read_text()
+    except FileNotFoundError:
+        return DEV_AGENT_FALLBACK
+
+# Fix-it guidance appended after a build error in the implementation prompts
+BUILD_ERROR_GUIDANCE = """### How to fix:
+1. Read each error message carefully - note the FILE and LINE NUMBER
+2. Common GBDK/SDCC compile errors:
+   - 'undefined identifier' → Missing #include, typo in name, or declaration missing
+   - 'syntax error' → Missing semicolon, brace, or parenthesis
+   - 'conflicting types' → Function signature doesn't match declaration in .h file
+   - 'expected' → Usually a missing token like ';' or ')'
+3. Linker errors (ASlink 'Undefined Global'):
+   - This means a function is CALLED but never IMPLEMENTED
+   - You must add the function body to a .c file
+   - Check which .c file should contain the implementation
+4. Fix the EXACT errors shown - do not make unrelated changes
+5. Ensure .h declarations match .c implementations exactly
+
+"""
+
+
+# Build error locations ("src/game.c:214: error 26: ...") and local includes
+_ERROR_FILE_RE = re.compile(r'(src/[\w./-]+\.[ch]):\d+:')
+_ERROR_C_FILE_RE = re.compile(r'(src/[a-zA-Z0-9_]+\.c):\d+:')
+_INCLUDE_RE = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+
+# Function definitions listed in the "existing code inventory"
+_FUNC_DEF_RE = re.compile(
+    r'^(?:void|uint8_t|int8_t|uint16_t|int16_t|int|char|const\s+\w+)\s+(\w+)\s*\([^)]*\)\s*{',
+    re.MULTILINE
+)
+
+# "### src/file.c" headed code blocks (fallback when the JSON is unparseable)
+_FILE_BLOCK_RE = re.compile(r'###\s*(src/[^\s]+\.[ch])\s*\n```c?\n(.*?)```', re.DOTALL)
+
+# Markdown fences around Claude's JSON output
+_JSON_OPEN = "```json"
+_FENCE = "```"
+
+
+# Output budget for implementation calls. Responses repeat whole files, so the
+# budget scales with the source sent (~3.5 chars/token, plus JSON escaping
+# and room for new code) instead of always reserving the maximum.
+MAX_OUTPUT_TOKENS = 32768
+MIN_OUTPUT_TOKENS = 8192
+
+
+def _output_token_budget(files: dict[str, str]) -> int:
+    """Estimate max_tokens for a response that may rewrite any of these files."""
+    source_chars = sum(len(content) for content in files.values())
+    return min(MAX_OUTPUT_TOKENS, MIN_OUTPUT_TOKENS + source_chars // 2)
+
+
+# Shared API client - reused across CoderAgent instances so every agent in a
+# pipeline run rides the same pooled (keep-alive) connections
+_SHARED_CLIENT: Optional[anthropic.Anthropic] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def _get_shared_client() -> anthropic.Anthropic:
+    """Return the process-wide Anthropic client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                try:
+                    import h2  # noqa: F401 - httpx needs it for HTTP/2
+                    http2 = True
+                except ImportError:
+                    http2 = False
+                _SHARED_CLIENT = anthropic.Anthropic(
+                    http_client=httpx.Client(
+                        http2=http2,
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                    )
+                )
+    return _SHARED_CLIENT
+
+
 # System prompt for Phase 1: file selection
 FILE_SELECTOR_PROMPT = """You are analyzing a GameBoy codebase to determine which files need to be modified for a specific task.
 
@@ -91,6 +179,17 @@ class CoderResult:
     error: Optional[str] = None
 
 
+def _write_file_bytes(path: Path, data: bytes) -> None:
+    """Write data with a single open/write/close, bypassing text-mode buffering."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 class CoderAgent:
     """
     Coder agent that works with ContextPackage from Designer.
@@ -115,15 +214,20 @@ class CoderAgent:
             verbose: Print debug info
             log_callback: Optional callback(level, message) for log messages
         """
-        self.client = anthropic.Anthropic()
+        self.client = _get_shared_client()
         self.model = model
         self.log_callback = log_callback
-        self.log_callback = log_callback
         self.max_retries = max_retries
         self.verbose = verbose
+        self._last_progress = None
     
     def _log(self, level: str, message: str):
         """Log a message to console and callback."""
+        if level == "progress":
+            # Only forward progress when it actually moves
+            if message == self._last_progress:
+                return
+            self._last_progress = message
         if self.verbose:
             print(f"[Coder] {message}")
         if self.log_callback:
@@ -133,7 +237,7 @@ class CoderAgent:
                 pass
     
     def _stream_message(
-        self, system: str, prompt: str, max_tokens: int = 32768, model: str = None
+        self, system: str, prompt: str, max_tokens: int = MAX_OUTPUT_TOKENS, model: str = None
     ) -> dict:
         """
         Call Claude API with streaming to avoid timeout errors.
@@ -247,8 +351,10 @@ class CoderAgent:
         
         # Combine headers + selected impl files
         files_for_coding = {**header_files, **selected_impl_files}
+        baseline = dict(all_files)  # Files as they were before any attempt
         
         last_error = None
+        truncated = False  # Once a response hits the budget, retry with the max
         
         # Phase 2: Implement with Sonnet
         for attempt in range(1, self.max_retries + 1):
@@ -268,12 +374,16 @@ class CoderAgent:
             prompt = self._build_direct_prompt(user_request, files_for_coding, last_error)
             
             try:
-                response = self._stream_message(DEV_AGENT_INSTRUCTIONS, prompt)
+                response = self._stream_message(
+                    get_dev_agent_instructions(), prompt,
+                    max_tokens=MAX_OUTPUT_TOKENS if truncated else _output_token_budget(files_for_coding)
+                )
                 response_text = response["text"]
                 
                 if response["stop_reason"] == 'max_tokens':
                     self._log("warning", "   ⚠️ Response truncated (token limit)")
                     last_error = "Response was truncated. Try a more focused request."
+                    truncated = True
                     continue
                 
                 # Parse response
@@ -285,26 +395,17 @@ class CoderAgent:
                     continue
                 
                 # Apply changes
-                files_changed = []
-                for filepath, content in result["files"].items():
-                    full_path = project_path / filepath
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    change_type = "created" if not full_path.exists() else "modified"
-                    full_path.write_text(content)
-                    
-                    files_changed.append(FileChange(
-                        path=filepath,
-                        content=content,
-                        change_type=change_type
-                    ))
+                files_changed = self._apply_file_changes(project_path, result["files"], all_files, baseline)
                 
                 file_names = [fc.path.split('/')[-1] for fc in files_changed]
                 self._log("info", f"   📝 Wrote: {', '.join(file_names)}")
                 
                 # Build
                 self._log("info", "   🔨 Building...")
-                build_result = self._build_project(project_path)
+                build_result = self._build_project(
+                    project_path,
+                    force_clean=any(fc.change_type == "created" for fc in files_changed)
+                )
                 
                 if not build_result["success"]:
                     last_error = build_result["error"]
@@ -451,6 +552,11 @@ class CoderAgent:
         all_features_implemented = set()
         previous_step_summary = None  # Track what previous step accomplished
         
+        # Read the sources once; each step keeps this map in sync with what it
+        # writes (the build only touches build/ and context/), so later steps
+        # can build their prompts without re-reading the project
+        project_files = self._read_project_files(project_path)
+        
         for step in steps:
             self._log("step", f"Step {step.order}/{total_steps}: {step.title}")
             
@@ -458,7 +564,8 @@ class CoderAgent:
             step_result = self._implement_single_step(
                 context, step, project_path,
                 reviewer_feedback if step.order == 1 else None,  # Only apply reviewer feedback to first step
-                previous_step_summary
+                previous_step_summary,
+                project_files
             )
             
             if not step_result.success:
@@ -506,7 +613,8 @@ class CoderAgent:
         step,  # ImplementationStep
         project_path: Path,
         reviewer_feedback: str = None,
-        previous_step_summary: str = None
+        previous_step_summary: str = None,
+        project_files: Optional[dict[str, str]] = None
     ) -> CoderResult:
         """
         Implement a single step using two-phase approach:
@@ -520,12 +628,14 @@ class CoderAgent:
             project_path: Path to the project
             reviewer_feedback: Feedback from reviewer (first step only)
             previous_step_summary: Summary of what was done in previous step
+            project_files: Current source files, if already in memory. Updated
+                in place with every file this step writes.
         """
         # Load symbol index (from file if available, otherwise generate)
         symbols = load_symbol_index(project_path)
         
         # Read all files (we'll selectively send them)
-        all_files = self._read_project_files(project_path)
+        all_files = project_files if project_files is not None else self._read_project_files(project_path)
         header_files = {k: v for k, v in all_files.items() if k.endswith('.h')}
         impl_files = {k: v for k, v in all_files.items() if k.endswith('.c')}
         
@@ -550,7 +660,9 @@ class CoderAgent:
         # Combine headers + selected impl files
         files_for_coding = {**header_files, **selected_impl_files}
         
+        baseline = dict(all_files)  # Files as they were before this step's attempts
         last_error = None
+        truncated = False  # Once a response hits the budget, retry with the max
         
         # Phase 2: Implement with selected files
         for attempt in range(1, self.max_retries + 1):
@@ -566,21 +678,29 @@ class CoderAgent:
             
             self._log("info", f"   🤖 Phase 2: Implementing...")
             
-            # Build prompt with selected files only
+            # Build prompt with selected files only. Build-error retries are
+            # narrowed to the failing files, except on the last attempt.
+            prompt_files = files_for_coding
+            if last_error and attempt < self.max_retries:
+                prompt_files = self._focus_files_on_error(files_for_coding, last_error)
             prompt = self._build_step_prompt(
-                context, step, files_for_coding, last_error, 
+                context, step, prompt_files, last_error, 
                 reviewer_feedback, previous_step_summary
             )
             
             try:
                 # Call Claude with streaming
-                response = self._stream_message(DEV_AGENT_INSTRUCTIONS, prompt)
+                response = self._stream_message(
+                    get_dev_agent_instructions(), prompt,
+                    max_tokens=MAX_OUTPUT_TOKENS if truncated else _output_token_budget(prompt_files)
+                )
                 
                 response_text = response["text"]
                 
                 if response["stop_reason"] == 'max_tokens':
                     self._log("warning", "   ⚠️ Response truncated (token limit)")
                     last_error = "Response was truncated - file too large. Try simplifying the change."
+                    truncated = True
                     continue
                 
                 # Parse response
@@ -592,19 +712,7 @@ class CoderAgent:
                     continue
                 
                 # Apply changes
-                files_changed = []
-                for filepath, content in result["files"].items():
-                    full_path = project_path / filepath
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    change_type = "created" if not full_path.exists() else "modified"
-                    full_path.write_text(content)
-                    
-                    files_changed.append(FileChange(
-                        path=filepath,
-                        content=content,
-                        change_type=change_type
-                    ))
+                files_changed = self._apply_file_changes(project_path, result["files"], all_files, baseline)
                 
                 # Log files written
                 file_names = [fc.path.split('/')[-1] for fc in files_changed]
@@ -612,13 +720,16 @@ class CoderAgent:
                 
                 # Build
                 self._log("info", f"   🔨 Building...")
-                build_result = self._build_project(project_path)
+                build_result = self._build_project(
+                    project_path,
+                    force_clean=any(fc.change_type == "created" for fc in files_changed)
+                )
                 
                 if not build_result["success"]:
                     last_error = build_result["error"]
-                    # Update current_files with what we wrote (for retry context)
+                    # Update files_for_coding with what we wrote (for retry context)
                     for fc in files_changed:
-                        current_files[fc.path] = fc.content
+                        files_for_coding[fc.path] = fc.content
                     
                     # Extract error lines - look for common compiler error patterns
                     # SDCC/GBDK errors often contain: "error", "Error", "undefined", "syntax"
@@ -682,8 +793,10 @@ class CoderAgent:
         
         # Read current file contents
         current_files = self._read_project_files(project_path)
+        baseline = dict(current_files)  # Files as they were before any attempt
         
         last_error = None
+        truncated = False  # Once a response hits the budget, retry with the max
         
         for attempt in range(1, self.max_retries + 1):
             if self.verbose:
@@ -694,7 +807,10 @@ class CoderAgent:
             
             try:
                 # Call Claude with streaming (avoids timeout errors on long requests)
-                response = self._stream_message(DEV_AGENT_INSTRUCTIONS, prompt)
+                response = self._stream_message(
+                    get_dev_agent_instructions(), prompt,
+                    max_tokens=MAX_OUTPUT_TOKENS if truncated else _output_token_budget(current_files)
+                )
                 
                 response_text = response["text"]
                 
@@ -703,6 +819,7 @@ class CoderAgent:
                     if self.verbose:
                         print(f"[Coder] WARNING: Response was truncated (hit token limit)")
                     last_error = "Response was truncated - file too large. Try simplifying the change."
+                    truncated = True
                     continue
                 
                 # Parse response
@@ -713,31 +830,19 @@ class CoderAgent:
                     continue
                 
                 # Apply changes
-                files_changed = []
-                for filepath, content in result["files"].items():
-                    full_path = project_path / filepath
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    change_type = "created" if not full_path.exists() else "modified"
-                    full_path.write_text(content)
-                    
-                    files_changed.append(FileChange(
-                        path=filepath,
-                        content=content,
-                        change_type=change_type
-                    ))
-                    
-                    if self.verbose:
-                        print(f"[Coder] {change_type.capitalize()}: {filepath}")
+                files_changed = self._apply_file_changes(project_path, result["files"], current_files, baseline)
+                if self.verbose:
+                    for fc in files_changed:
+                        print(f"[Coder] {fc.change_type.capitalize()}: {fc.path}")
                 
                 # Build
-                build_result = self._build_project(project_path)
+                build_result = self._build_project(
+                    project_path,
+                    force_clean=any(fc.change_type == "created" for fc in files_changed)
+                )
                 
                 if not build_result["success"]:
                     last_error = build_result["error"]
-                    # Update files_for_coding with what we wrote (for retry context)
-                    for fc in files_changed:
-                        files_for_coding[fc.path] = fc.content
                     
                     if self.verbose:
                         # Extract meaningful error lines
@@ -782,6 +887,52 @@ class CoderAgent:
             build_error=last_error
         )
     
+    def _apply_file_changes(
+        self,
+        project_path: Path,
+        files: dict[str, str],
+        current_files: dict[str, str],
+        baseline: dict[str, Optional[str]]
+    ) -> list[FileChange]:
+        """
+        Write the files returned by Claude to disk and record each change.
+        
+        Files whose content is identical to current_files (what is on disk
+        now) are not rewritten, so re-emitted headers don't touch mtimes and
+        trigger recompiles. current_files is updated in place with everything
+        written.
+        
+        Changes are reported against baseline, the files as they were before
+        this step or request, so a file written by an earlier failed attempt
+        and re-emitted unchanged on a retry is still listed. Paths missing
+        from baseline are added on first sight (None if they did not exist).
+        """
+        files_changed = []
+        for filepath, content in files.items():
+            full_path = project_path / filepath
+            if filepath not in baseline:
+                try:
+                    baseline[filepath] = full_path.read_text()
+                except FileNotFoundError:
+                    baseline[filepath] = None
+                else:
+                    current_files.setdefault(filepath, baseline[filepath])
+            
+            if current_files.get(filepath) != content:
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_file_bytes(full_path, content.encode())
+                current_files[filepath] = content
+            
+            previous = baseline[filepath]
+            if previous == content:
+                continue
+            files_changed.append(FileChange(
+                path=filepath,
+                content=content,
+                change_type="created" if previous is None else "modified"
+            ))
+        return files_changed
+    
     def _read_project_files(self, project_path: Path) -> dict[str, str]:
         """Read all source files from project."""
         files = {}
@@ -863,10 +1014,10 @@ class CoderAgent:
         """Parse the file selection response from Phase 1."""
         try:
             # Extract JSON from response
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0]
+            if _JSON_OPEN in response_text:
+                json_str = response_text.split(_JSON_OPEN)[1].split(_FENCE)[0]
+            elif _FENCE in response_text:
+                json_str = response_text.split(_FENCE)[1].split(_FENCE)[0]
             else:
                 # Try to find raw JSON
                 start = response_text.find("{")
@@ -896,12 +1047,32 @@ class CoderAgent:
     def _extract_files_from_error(self, error: str, available_files: dict[str, str]) -> list[str]:
         """Extract file paths mentioned in build errors."""
         # Error format: "src/game.c:214: error 26: ..."
-        error_file_pattern = r'(src/[a-zA-Z0-9_]+\.c):\d+:'
-        error_files = set(re.findall(error_file_pattern, error))
+        error_files = set(_ERROR_C_FILE_RE.findall(error))
         
         # Only return files that exist in available_files
         return [f for f in error_files if f in available_files]
     
+    def _focus_files_on_error(self, current_files: dict[str, str], error: str) -> dict[str, str]:
+        """
+        Narrow the files sent on a build-error retry.
+        
+        Keeps the files named in the compiler output plus the headers they
+        directly #include. Falls back to all files when the error names none
+        (e.g. linker errors, which only report symbol names).
+        """
+        focused = {f: current_files[f] for f in set(_ERROR_FILE_RE.findall(error)) if f in current_files}
+        if not focused:
+            return current_files
+        
+        for content in list(focused.values()):
+            for include in _INCLUDE_RE.findall(content):
+                include_path = f"src/{include}"
+                if include_path in current_files:
+                    focused[include_path] = current_files[include_path]
+        
+        self._log("info", f"   🎯 Retry focused on: {', '.join(sorted(focused))}")
+        return focused
+    
     def _build_step_prompt(
         self,
         context,
@@ -916,113 +1087,112 @@ class CoderAgent:
         The Coder now sees ALL project files and decides what to modify based on
         the step description and the actual code. No pre-determined file targeting.
         """
-        parts = []
+        buf = io.StringIO()
+        w = buf.write
         
         # On retry with reviewer feedback, use lightweight context
         if reviewer_feedback:
-            parts.append(self._build_retry_context(context, step, reviewer_feedback))
+            opening = self._build_retry_context(context, step, reviewer_feedback)
         else:
             # Use step-focused context from ContextPackage
-            parts.append(context.to_step_context(step))
+            opening = context.to_step_context(step)
+        w(opening)
+        w("\n")
         
         # Add previous step summary if available (for context continuity)
         if previous_step_summary:
-            parts.append("\n## Previous Step Summary")
-            parts.append("Here's what was accomplished in the previous step:")
-            parts.append(previous_step_summary)
-            parts.append("")
+            w("\n## Previous Step Summary\n")
+            w("Here's what was accomplished in the previous step:\n")
+            w(previous_step_summary)
+            w("\n")
+            w("\n")
         
         # Separate header files (.h) from implementation files (.c)
         header_files = {k: v for k, v in current_files.items() if k.endswith('.h')}
         impl_files = {k: v for k, v in current_files.items() if k.endswith('.c')}
         
         # Add code inventory - explicitly list what exists and MUST be preserved
-        parts.append("\n## ⚠️ EXISTING CODE INVENTORY (MUST PRESERVE)")
-        parts.append("The following functions and features ALREADY EXIST and MUST NOT be removed:")
-        parts.append("")
+        w("\n## ⚠️ EXISTING CODE INVENTORY (MUST PRESERVE)\n")
+        w("The following functions and features ALREADY EXIST and MUST NOT be removed:\n")
+        w("\n")
         
         # Extract function names from each .c file  
         for filepath in sorted(impl_files.keys()):
             content = impl_files[filepath]
             # Simple regex to find function definitions
-            func_pattern = r'^(?:void|uint8_t|int8_t|uint16_t|int16_t|int|char|const\s+\w+)\s+(\w+)\s*\([^)]*\)\s*{'
-            funcs = re.findall(func_pattern, content, re.MULTILINE)
+            funcs = _FUNC_DEF_RE.findall(content)
             if funcs:
-                parts.append(f"**{filepath}**: `{'`, `'.join(funcs)}`")
-        parts.append("")
-        parts.append("**Do NOT delete any of these functions unless the task explicitly says to remove them.**")
-        parts.append("")
+                w(f"**{filepath}**: `{'`, `'.join(funcs)}`\n")
+        w("\n")
+        w("**Do NOT delete any of these functions unless the task explicitly says to remove them.**\n")
+        w("\n")
         
         # Always include ALL header files (they contain API contracts, are small)
-        parts.append("\n## Header Files (API contracts)")
-        parts.append("All header files for reference. These define the interfaces.")
+        w("\n## Header Files (API contracts)\n")
+        w("All header files for reference. These define the interfaces.\n")
         for filepath in sorted(header_files.keys()):
-            parts.append(f"\n### {filepath}")
-            parts.append(f"```c\\n{header_files[filepath]}\\n```")
+            w("\n### ")
+            w(filepath)
+            w("\n```c\n")
+            w(header_files[filepath])
+            w("\n```\n")
         
         # Show ALL implementation files - Coder decides what needs to change
-        parts.append("\n## Implementation Files")
-        parts.append("All implementation files in the project. Analyze the code and determine which files")
-        parts.append("need to be modified to accomplish this step. Return COMPLETE file contents for any files you modify.")
+        w("\n## Implementation Files\n")
+        w("All implementation files in the project. Analyze the code and determine which files\n")
+        w("need to be modified to accomplish this step. Return COMPLETE file contents for any files you modify.\n")
         for filepath in sorted(impl_files.keys()):
-            parts.append(f"\n### {filepath}")
-            parts.append(f"```c\n{impl_files[filepath]}\n```")
+            w("\n### ")
+            w(filepath)
+            w("\n```c\n")
+            w(impl_files[filepath])
+            w("\n```\n")
         
         # Reviewer feedback section (already included in retry context, but add emphasis)
-        if reviewer_feedback and "REVIEWER FEEDBACK" not in parts[0]:
-            parts.append("\n## ⚠️ REVIEWER FEEDBACK - ADDRESS THESE ISSUES!")
-            parts.append(reviewer_feedback)
+        if reviewer_feedback and "REVIEWER FEEDBACK" not in opening:
+            w("\n## ⚠️ REVIEWER FEEDBACK - ADDRESS THESE ISSUES!\n")
+            w(reviewer_feedback)
+            w("\n")
         
         # Previous error - give prominent placement and specific guidance
         if last_error:
-            parts.append("\n## ⛔ BUILD ERROR - YOUR PREVIOUS CODE FAILED TO COMPILE")
-            parts.append("")
-            parts.append("The code you generated has compilation errors. You MUST fix these before proceeding.")
-            parts.append("")
-            parts.append("### Error Output:")
-            parts.append(f"```\n{last_error[:2000]}\n```")
-            parts.append("")
-            parts.append("### How to fix:")
-            parts.append("1. Read each error message carefully - note the FILE and LINE NUMBER")
-            parts.append("2. Common GBDK/SDCC compile errors:")
-            parts.append("   - 'undefined identifier' → Missing #include, typo in name, or declaration missing")
-            parts.append("   - 'syntax error' → Missing semicolon, brace, or parenthesis")
-            parts.append("   - 'conflicting types' → Function signature doesn't match declaration in .h file")
-            parts.append("   - 'expected' → Usually a missing token like ';' or ')'")
-            parts.append("3. Linker errors (ASlink 'Undefined Global'):")
-            parts.append("   - This means a function is CALLED but never IMPLEMENTED")
-            parts.append("   - You must add the function body to a .c file")
-            parts.append("   - Check which .c file should contain the implementation")
-            parts.append("4. Fix the EXACT errors shown - do not make unrelated changes")
-            parts.append("5. Ensure .h declarations match .c implementations exactly")
-            parts.append("")
+            w("\n## ⛔ BUILD ERROR - YOUR PREVIOUS CODE FAILED TO COMPILE\n")
+            w("\n")
+            w("The code you generated has compilation errors. You MUST fix these before proceeding.\n")
+            w("\n")
+            w("### Error Output:\n")
+            w("```\n")
+            w(last_error[:2000])
+            w("\n```\n")
+            w("\n")
+            w(BUILD_ERROR_GUIDANCE)
         
         # Final instruction with strong preservation emphasis
-        parts.append("\n## Task")
+        w("\n## Task\n")
         if last_error:
-            parts.append("**⛔ PRIORITY: FIX THE BUILD ERRORS** shown above.")
-            parts.append("Carefully analyze each error message and fix the issues in your code.")
-            parts.append("Return the COMPLETE corrected file contents.")
-            parts.append("")
-            parts.append("**⚠️ PRESERVE ALL EXISTING CODE** - only fix the specific errors, don't remove unrelated code.")
+            w("**⛔ PRIORITY: FIX THE BUILD ERRORS** shown above.\n")
+            w("Carefully analyze each error message and fix the issues in your code.\n")
+            w("Return the COMPLETE corrected file contents.\n")
+            w("\n")
+            w("**⚠️ PRESERVE ALL EXISTING CODE** - only fix the specific errors, don't remove unrelated code.\n")
         elif reviewer_feedback:
-            parts.append("**FIX THE REVIEWER ISSUES** listed above.")
-            parts.append("Return complete file contents for the fixed files.")
-            parts.append("")
-            parts.append("**⚠️ PRESERVE ALL EXISTING CODE** - only fix the specific issues mentioned.")
+            w("**FIX THE REVIEWER ISSUES** listed above.\n")
+            w("Return complete file contents for the fixed files.\n")
+            w("\n")
+            w("**⚠️ PRESERVE ALL EXISTING CODE** - only fix the specific issues mentioned.\n")
         else:
-            parts.append(f"Implement ONLY this step: **{step.title}**")
-            parts.append("")
-            parts.append("**⚠️ CRITICAL - CODE PRESERVATION:**")
-            parts.append("- KEEP all existing functions, variables, and logic NOT related to this step")
-            parts.append("- ADD new code to implement the feature - don't REPLACE existing code")
-            parts.append("- If modifying a function, preserve all other functions in that file")
-            parts.append("- Only change the minimum code necessary for this specific step")
-            parts.append("")
-            parts.append("Return complete file contents for any files you modify (including headers if needed).")
-            parts.append("Do NOT implement features from other steps - stay focused on this one.")
-        
-        return "\n".join(parts)
+            w(f"Implement ONLY this step: **{step.title}**\n")
+            w("\n")
+            w("**⚠️ CRITICAL - CODE PRESERVATION:**\n")
+            w("- KEEP all existing functions, variables, and logic NOT related to this step\n")
+            w("- ADD new code to implement the feature - don't REPLACE existing code\n")
+            w("- If modifying a function, preserve all other functions in that file\n")
+            w("- Only change the minimum code necessary for this specific step\n")
+            w("\n")
+            w("Return complete file contents for any files you modify (including headers if needed).\n")
+            w("Do NOT implement features from other steps - stay focused on this one.\n")
+        
+        return buf.getvalue()
     
     def _build_retry_context(
         self,
@@ -1071,60 +1241,55 @@ class CoderAgent:
         reviewer_feedback: Optional[str] = None
     ) -> str:
         """Build the prompt for Claude (legacy mode)."""
-        parts = []
+        buf = io.StringIO()
+        w = buf.write
         
         # Use the ContextPackage's formatted context
-        parts.append(context.to_prompt_context())
+        w(context.to_prompt_context())
+        w("\n")
         
         # Current file contents
-        parts.append("\n## Current File Contents")
-        parts.append("These are the COMPLETE current files. Modify and return complete files.")
+        w("\n## Current File Contents\n")
+        w("These are the COMPLETE current files. Modify and return complete files.\n")
         
         for filepath, content in sorted(current_files.items()):
-            parts.append(f"\n### {filepath}")
-            parts.append(f"```c\n{content}\n```")
+            w("\n### ")
+            w(filepath)
+            w("\n```c\n")
+            w(content)
+            w("\n```\n")
         
         # Reviewer feedback from previous attempt
         if reviewer_feedback:
-            parts.append("\n## ⚠️ REVIEWER FEEDBACK - ADDRESS THESE ISSUES!")
-            parts.append("Your previous implementation had critical issues that must be fixed:")
-            parts.append(reviewer_feedback)
+            w("\n## ⚠️ REVIEWER FEEDBACK - ADDRESS THESE ISSUES!\n")
+            w("Your previous implementation had critical issues that must be fixed:\n")
+            w(reviewer_feedback)
+            w("\n")
         
         # Previous error - give prominent placement and specific guidance
         if last_error:
-            parts.append("\n## ⛔ BUILD ERROR - YOUR PREVIOUS CODE FAILED TO COMPILE")
-            parts.append("")
-            parts.append("The code you generated has compilation errors. You MUST fix these before proceeding.")
-            parts.append("")
-            parts.append("### Error Output:")
-            parts.append(f"```\n{last_error[:2000]}\n```")
-            parts.append("")
-            parts.append("### How to fix:")
-            parts.append("1. Read each error message carefully - note the FILE and LINE NUMBER")
-            parts.append("2. Common GBDK/SDCC compile errors:")
-            parts.append("   - 'undefined identifier' → Missing #include, typo in name, or declaration missing")
-            parts.append("   - 'syntax error' → Missing semicolon, brace, or parenthesis")
-            parts.append("   - 'conflicting types' → Function signature doesn't match declaration in .h file")
-            parts.append("   - 'expected' → Usually a missing token like ';' or ')'")
-            parts.append("3. Linker errors (ASlink 'Undefined Global'):")
-            parts.append("   - This means a function is CALLED but never IMPLEMENTED")
-            parts.append("   - You must add the function body to a .c file")
-            parts.append("   - Check which .c file should contain the implementation")
-            parts.append("4. Fix the EXACT errors shown - do not make unrelated changes")
-            parts.append("5. Ensure .h declarations match .c implementations exactly")
-            parts.append("")
+            w("\n## ⛔ BUILD ERROR - YOUR PREVIOUS CODE FAILED TO COMPILE\n")
+            w("\n")
+            w("The code you generated has compilation errors. You MUST fix these before proceeding.\n")
+            w("\n")
+            w("### Error Output:\n")
+            w("```\n")
+            w(last_error[:2000])
+            w("\n```\n")
+            w("\n")
+            w(BUILD_ERROR_GUIDANCE)
         
         # Final instruction
-        parts.append("\n## Task")
+        w("\n## Task\n")
         if last_error:
-            parts.append("**⛔ PRIORITY: FIX THE BUILD ERRORS** shown above.")
-            parts.append("Carefully analyze each error message and fix the issues in your code.")
-            parts.append("Return the COMPLETE corrected file contents.")
+            w("**⛔ PRIORITY: FIX THE BUILD ERRORS** shown above.\n")
+            w("Carefully analyze each error message and fix the issues in your code.\n")
+            w("Return the COMPLETE corrected file contents.\n")
         else:
-            parts.append("Implement the requested features. Return complete file contents for any files you modify.")
-            parts.append("Only modify files that need changes. Preserve existing functionality.")
+            w("Implement the requested features. Return complete file contents for any files you modify.\n")
+            w("Only modify files that need changes. Preserve existing functionality.\n")
         
-        return "\n".join(parts)
+        return buf.getvalue()
     
     def _parse_response(self, response_text: str) -> dict:
         """Parse Claude's response, extracting JSON even with preamble text."""
@@ -1132,17 +1297,17 @@ class CoderAgent:
             # Find JSON in response - handle preamble text before ```json
             json_str = response_text
             
-            if "```json" in json_str:
+            if _JSON_OPEN in json_str:
                 # Extract content between ```json and closing ```
-                after_marker = json_str.split("```json", 1)[1]
-                if "```" in after_marker:
-                    json_str = after_marker.split("```", 1)[0]
+                after_marker = json_str.split(_JSON_OPEN, 1)[1]
+                if _FENCE in after_marker:
+                    json_str = after_marker.split(_FENCE, 1)[0]
                 else:
                     # No closing ```, take the rest
                     json_str = after_marker
-            elif "```" in json_str:
+            elif _FENCE in json_str:
                 # Try to find a code block containing "files"
-                for block in json_str.split("```"):
+                for block in json_str.split(_FENCE):
                     stripped = block.strip()
                     if stripped.startswith("{") and '"files"' in stripped:
                         json_str = stripped
@@ -1160,11 +1325,11 @@ class CoderAgent:
             if self.verbose:
                 print(f"[Coder] JSON parse failed: {e}")
                 # Show where the JSON was truncated
-                if "```json" in response_text:
+                if _JSON_OPEN in response_text:
                     try:
-                        extracted = response_text.split("```json", 1)[1]
-                        if "```" in extracted:
-                            extracted = extracted.split("```", 1)[0]
+                        extracted = response_text.split(_JSON_OPEN, 1)[1]
+                        if _FENCE in extracted:
+                            extracted = extracted.split(_FENCE, 1)[0]
                         print(f"[Coder] Extracted JSON length: {len(extracted)}")
                         print(f"[Coder] JSON end preview: ...{extracted[-300:]}")
                     except:
@@ -1173,42 +1338,52 @@ class CoderAgent:
     
     def _fallback_parse(self, response_text: str) -> dict:
         """Fallback parser for when JSON fails."""
-        import re
-        
         files = {}
         
         # Look for file headers and code blocks
-        pattern = r'###\s*(src/[^\s]+\.[ch])\s*\n```c?\n(.*?)```'
-        matches = re.findall(pattern, response_text, re.DOTALL)
-        
-        for filepath, content in matches:
+        for filepath, content in _FILE_BLOCK_RE.findall(response_text):
             files[filepath.strip()] = content.strip()
         
         return {"files": files} if files else {}
     
-    def _build_project(self, project_path: Path) -> dict:
-        """Build the project using make."""
-        result = subprocess.run(
-            ["make", "rebuild"],
-            cwd=project_path,
-            capture_output=True,
-            text=True
-        )
+    def _build_project(self, project_path: Path, force_clean: bool = False) -> dict:
+        """
+        Build the project using an incremental, parallel make.
         
-        success = result.returncode == 0
+        Args:
+            project_path: Path to the project
+            force_clean: Run `make clean` first (needed when files were added,
+                since the wildcard source lists are not tracked by make)
+        """
+        if force_clean:
+            subprocess.run(
+                ["make", "clean"],
+                cwd=project_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
         
-        # Combine stdout and stderr for error reporting
-        # GBDK/SDCC compilers often output errors to stdout
-        combined_output = ""
-        if result.stdout:
-            combined_output += result.stdout
-        if result.stderr:
-            combined_output += "\n" + result.stderr if combined_output else result.stderr
+        # GBDK/SDCC compilers often output errors to stdout, so both streams
+        # go to one temp file that is only read back on failure -
+        # successful builds never pull the compiler chatter into Python
+        with tempfile.TemporaryFile() as log_file:
+            result = subprocess.run(
+                ["make", "-j", str(os.cpu_count() or 4)],
+                cwd=project_path,
+                stdout=log_file,
+                stderr=subprocess.STDOUT
+            )
+            
+            success = result.returncode == 0
+            combined_output = ""
+            if not success:
+                log_file.seek(0)
+                combined_output = log_file.read().decode(errors="replace").strip()
         
         return {
             "success": success,
-            "output": result.stdout,
-            "error": combined_output.strip() if not success else None
+            "output": combined_output,
+            "error": combined_output if not success else None
         }
 
 
@@ -5,20 +5,31 @@ Workspace manager for the coding agent.
 Handles project scaffolding, file operations, and build execution.
 """
 
+import asyncio
+import hashlib
 import os
 import re
 import shutil
 import subprocess
+import zlib
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 from dataclasses import dataclass
 
+# Threads used to read source files concurrently (reads release the GIL)
+READ_WORKERS = 8
+
+
+# Characters not allowed in Makefile project names
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
 
 def sanitize_project_name(name: str) -> str:
     """Sanitize project name for use in Makefiles (no spaces or special chars)."""
-    # Remove spaces and keep only alphanumeric, underscore, hyphen
-    sanitized = re.sub(r'[^a-zA-Z0-9_-]', '', name.replace(' ', ''))
-    return sanitized or 'Game'
+    # Keep only alphanumeric, underscore, hyphen (spaces included)
+    return _SANITIZE_RE.sub('', name) or 'Game'
 
 
 # Template Makefile for new projects
@@ -37,6 +48,11 @@ LCCFLAGS = -Wa-l -Wl-m -Wl-j
 
 # Source files - auto-discover all .c files in src/ and build/
 SRCS = $(wildcard src/*.c) $(wildcard build/*.c)
+HEADERS = $(wildcard src/*.h) $(wildcard build/*.h)
+
+# One object per source so `make -j` can compile them in parallel
+OBJS = $(patsubst %.c,build/obj/%.o,$(notdir $(SRCS)))
+vpath %.c src build
 
 # Output
 ROM = build/$(PROJECT_NAME).gb
@@ -47,10 +63,15 @@ all: datagen $(ROM)
 datagen:
 \t@if [ -f _schema.json ]; then $(DATA_GEN) .; fi
 
-$(ROM): $(SRCS)
+$(ROM): $(OBJS)
 \t@mkdir -p build
 \t$(LCC) $(LCCFLAGS) -o $@ $^
 
+# Headers aren't tracked per file, so any header change recompiles everything
+build/obj/%.o: %.c $(HEADERS) | datagen
+\t@mkdir -p build/obj
+\t$(LCC) $(LCCFLAGS) -c -o $@ $<
+
 clean:
 \trm -rf build
 
@@ -60,12 +81,14 @@ run: $(ROM)
 .PHONY: all clean run datagen
 '''
 
+# Source templates are written verbatim (never passed through .format)
+
 # Template main.c
 MAIN_C_TEMPLATE = '''#include <gb/gb.h>
 #include "game.h"
 #include "sprites.h"
 
-void main(void) {{
+void main(void) {
     // Initialize sprites
     sprites_init();
     
@@ -73,12 +96,12 @@ void main(void) {{
     game_init();
     
     // Main loop
-    while(1) {{
+    while(1) {
         game_update();
         game_render();
         vsync();
-    }}
-}}
+    }
+}
 '''
 
 # Template game.h
@@ -89,10 +112,10 @@ GAME_H_TEMPLATE = '''#ifndef GAME_H
 #include <stdint.h>
 
 // Game state structure
-typedef struct {{
+typedef struct {
     uint8_t initialized;
     // Add game state fields here
-}} GameState;
+} GameState;
 
 extern GameState game;
 
@@ -110,18 +133,18 @@ GAME_C_TEMPLATE = '''#include "game.h"
 
 GameState game;
 
-void game_init(void) {{
+void game_init(void) {
     game.initialized = 1;
     // Initialize game state here
-}}
+}
 
-void game_update(void) {{
+void game_update(void) {
     // Update game logic here
-}}
+}
 
-void game_render(void) {{
+void game_render(void) {
     // Render game objects here
-}}
+}
 '''
 
 # Template sprites.h
@@ -142,7 +165,7 @@ SPRITES_C_TEMPLATE = '''#include "sprites.h"
 
 // Sprite tile data - 8x8 pixels, 2bpp
 // Each row is 2 bytes (16 bytes total per tile)
-const uint8_t sprite_data[] = {{
+const uint8_t sprite_data[] = {
     // Empty placeholder sprite
     0x00, 0x00,
     0x00, 0x00,
@@ -152,17 +175,101 @@ const uint8_t sprite_data[] = {{
     0x00, 0x00,
     0x00, 0x00,
     0x00, 0x00
-}};
+};
 
-void sprites_init(void) {{
+void sprites_init(void) {
     // Load sprite tiles into VRAM
     set_sprite_data(0, 1, sprite_data);
     
     // Enable sprites
     SHOW_SPRITES;
-}}
+}
 '''
 
+# Source templates pre-encoded once, keyed by filename under src/
+_TEMPLATE_BYTES = {
+    "main.c": MAIN_C_TEMPLATE.encode(),
+    "game.h": GAME_H_TEMPLATE.encode(),
+    "game.c": GAME_C_TEMPLATE.encode(),
+    "sprites.h": SPRITES_H_TEMPLATE.encode(),
+    "sprites.c": SPRITES_C_TEMPLATE.encode(),
+}
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    """
+    Yield the path of every file under root.
+    
+    os.walk splits files from directories using the readdir entry type, so
+    unlike Path.glob + is_file() there is no stat() per path.
+    """
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+def _write_if_absent(path: str | Path, data: bytes) -> None:
+    """Create path with data unless it already exists (one open, no stat)."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _content_digest(data: bytes) -> bytes:
+    """Short content hash used to skip rewriting unchanged files."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_all(paths: list[str]) -> list[bytes]:
+    """
+    Read many small files, returning their contents in order.
+    
+    This is the single bulk-read point for workspace snapshots. Reads are
+    overlapped on a thread pool; a lone file is read inline since the pool
+    would only add overhead.
+    """
+    if len(paths) <= 1:
+        return [_read_bytes(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        return list(pool.map(_read_bytes, paths))
+
+
+class SourceCheckpoint(Mapping[str, str]):
+    """
+    Snapshot of source files, held zlib-compressed.
+    
+    Reads like a dict of relative path -> content. Each file is decompressed
+    only when accessed, so a checkpoint costs a fraction of the source size
+    and restoring it only materializes one file at a time.
+    """
+    
+    def __init__(self, files: dict[str, bytes]):
+        self._blobs = {rel: zlib.compress(data, 1) for rel, data in files.items()}
+        self._digests = {rel: _content_digest(data) for rel, data in files.items()}
+    
+    def digest(self, rel_path: str) -> bytes:
+        """Content hash of a checkpointed file, without decompressing it."""
+        return self._digests[rel_path]
+    
+    def __getitem__(self, rel_path: str) -> str:
+        return zlib.decompress(self._blobs[rel_path]).decode()
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blobs)
+    
+    def __len__(self) -> int:
+        return len(self._blobs)
+
 
 @dataclass
 class BuildResult:
@@ -189,6 +296,10 @@ class Workspace:
         self.src_dir = self.path / "src"
         self.build_dir = self.path / "build"
         
+        # Plain-string copies for per-file hot paths (no PurePath parsing)
+        self._path_str = str(self.path)
+        self._src_str = os.path.join(self._path_str, "src")
+        
     def scaffold(self) -> None:
         """Create the initial project structure with template files."""
         # Create directories
@@ -197,37 +308,29 @@ class Workspace:
         self.build_dir.mkdir(exist_ok=True)
         
         # Create Makefile (sanitize name for shell compatibility)
-        makefile = self.path / "Makefile"
-        if not makefile.exists():
-            safe_name = sanitize_project_name(self.project_name)
-            makefile.write_text(MAKEFILE_TEMPLATE.format(project_name=safe_name))
+        safe_name = sanitize_project_name(self.project_name)
+        _write_if_absent(
+            self.path / "Makefile",
+            MAKEFILE_TEMPLATE.format(project_name=safe_name).encode()
+        )
         
         # Create source files
-        templates = {
-            "main.c": MAIN_C_TEMPLATE,
-            "game.h": GAME_H_TEMPLATE,
-            "game.c": GAME_C_TEMPLATE,
-            "sprites.h": SPRITES_H_TEMPLATE,
-            "sprites.c": SPRITES_C_TEMPLATE,
-        }
-        
-        for filename, content in templates.items():
-            filepath = self.src_dir / filename
-            if not filepath.exists():
-                filepath.write_text(content)
+        for filename, content in _TEMPLATE_BYTES.items():
+            _write_if_absent(os.path.join(self._src_str, filename), content)
     
     def read_file(self, relative_path: str) -> Optional[str]:
         """Read a file from the workspace."""
-        filepath = self.path / relative_path
-        if filepath.exists():
-            return filepath.read_text()
-        return None
+        try:
+            return _read_bytes(os.path.join(self._path_str, relative_path)).decode()
+        except FileNotFoundError:
+            return None
     
     def write_file(self, relative_path: str, content: str) -> None:
         """Write content to a file in the workspace."""
-        filepath = self.path / relative_path
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        filepath.write_text(content)
+        filepath = os.path.join(self._path_str, relative_path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(content.encode())
     
     def list_files(self, pattern: str = "**/*") -> list[Path]:
         """List files in the workspace matching a pattern."""
@@ -256,26 +359,14 @@ class Workspace:
             
             # Run make - combine stdout and stderr for complete output
             result = subprocess.run(
-                ["make"],
+                ["make", "-j", str(os.cpu_count() or 4)],
                 cwd=self.path,
                 capture_output=True,
                 text=True,
                 timeout=60
             )
             
-            rom_path = self.build_dir / f"{self.project_name}.gb"
-            
-            # Combine stdout and stderr for complete error context
-            combined_output = result.stdout
-            if result.stderr:
-                combined_output += "\n" + result.stderr
-            
-            return BuildResult(
-                success=result.returncode == 0,
-                output=combined_output,
-                error=result.stderr if result.returncode != 0 else None,
-                rom_path=rom_path if rom_path.exists() else None
-            )
+            return self._build_result(result.returncode, result.stdout, result.stderr)
             
         except subprocess.TimeoutExpired:
             return BuildResult(
@@ -290,60 +381,105 @@ class Workspace:
                 error=str(e)
             )
     
+    async def build_async(self, clean: bool = False) -> BuildResult:
+        """
+        Build the project without blocking the event loop.
+        
+        Runs build() on a worker thread, so both entry points share one
+        implementation.
+        
+        Args:
+            clean: Whether to clean before building
+            
+        Returns:
+            BuildResult with success status and output
+        """
+        return await asyncio.to_thread(self.build, clean)
+    
+    def _build_result(self, returncode: int, stdout: str, stderr: str) -> BuildResult:
+        """Turn make's exit status and output into a BuildResult."""
+        rom_path = self.build_dir / f"{self.project_name}.gb"
+        
+        # Combine stdout and stderr for complete error context
+        combined_output = stdout
+        if stderr:
+            combined_output += "\n" + stderr
+        
+        return BuildResult(
+            success=returncode == 0,
+            output=combined_output,
+            error=stderr if returncode != 0 else None,
+            rom_path=rom_path if rom_path.exists() else None
+        )
+    
     def clean(self) -> None:
         """Remove build artifacts."""
         if self.build_dir.exists():
             shutil.rmtree(self.build_dir)
         self.build_dir.mkdir(exist_ok=True)
     
+    def _snapshot_src(self) -> dict[str, bytes]:
+        """Read every file under src/, keyed by path relative to the workspace."""
+        paths = list(_walk_files(self._src_str))
+        return {
+            os.path.relpath(path, self._path_str): data
+            for path, data in zip(paths, _read_all(paths))
+        }
+    
     def get_current_state(self) -> dict:
         """Get a summary of the current workspace state."""
-        files = {}
-        for filepath in self.src_dir.glob("**/*"):
-            if filepath.is_file():
-                rel_path = filepath.relative_to(self.path)
-                files[str(rel_path)] = filepath.read_text()
-        
         return {
             "project_name": self.project_name,
-            "path": str(self.path),
-            "files": files
+            "path": self._path_str,
+            "files": {rel: data.decode() for rel, data in self._snapshot_src().items()}
         }
     
-    def create_checkpoint(self) -> dict[str, str]:
+    def create_checkpoint(self) -> SourceCheckpoint:
         """
         Create a checkpoint of the current source files.
         
         Returns:
-            Dict of filepath -> content for all source files
+            Mapping of filepath -> content for all source files
         """
-        checkpoint = {}
-        for filepath in self.src_dir.glob("**/*"):
-            if filepath.is_file():
-                rel_path = str(filepath.relative_to(self.path))
-                checkpoint[rel_path] = filepath.read_text()
-        return checkpoint
+        return SourceCheckpoint(self._snapshot_src())
     
-    def restore_checkpoint(self, checkpoint: dict[str, str]) -> None:
+    def restore_checkpoint(self, checkpoint: Mapping[str, str]) -> None:
         """
         Restore workspace to a previous checkpoint state.
         
         Args:
-            checkpoint: Dict of filepath -> content to restore
+            checkpoint: Mapping of filepath -> content to restore
         """
-        # Get current files
-        current_files = set()
-        for filepath in self.src_dir.glob("**/*"):
-            if filepath.is_file():
-                current_files.add(str(filepath.relative_to(self.path)))
+        # One pass over src/: drop files the checkpoint doesn't have and
+        # collect the rest so their contents can be compared
+        kept_paths = []
+        kept_rels = []
+        for path in _walk_files(self._src_str):
+            rel_path = os.path.relpath(path, self._path_str)
+            if rel_path in checkpoint:
+                kept_paths.append(path)
+                kept_rels.append(rel_path)
+            else:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
         
-        # Restore checkpoint files
-        for rel_path, content in checkpoint.items():
-            self.write_file(rel_path, content)
+        # Hash surviving files so unchanged ones are not rewritten
+        current_hashes = {
+            rel_path: _content_digest(data)
+            for rel_path, data in zip(kept_rels, _read_all(kept_paths))
+        }
         
-        # Remove files that weren't in the checkpoint
-        checkpoint_files = set(checkpoint.keys())
-        for rel_path in current_files - checkpoint_files:
-            filepath = self.path / rel_path
-            if filepath.exists():
-                filepath.unlink()
+        # Restore checkpoint files that differ from what is on disk
+        for rel_path in checkpoint:
+            if isinstance(checkpoint, SourceCheckpoint):
+                digest = checkpoint.digest(rel_path)
+                if current_hashes.get(rel_path) == digest:
+                    continue
+                content = checkpoint[rel_path]
+            else:
+                content = checkpoint[rel_path]
+                if current_hashes.get(rel_path) == _content_digest(content.encode()):
+                    continue
+            self.write_file(rel_path, content)
@@ -15,14 +15,57 @@ import os
 import sys
 import json
 import argparse
+import asyncio
+import functools
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from src.agents.context.summary_generator import SummaryGenerator, generate_summary
 
+# Console icon for each migration result status
+_STATUS_ICONS = {
+    "migrated": "✅",
+    "skipped": "⏭️",
+    "dry_run": "🔍",
+    "error": "❌"
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _load_metadata_cached(path_str: str, mtime_ns: int) -> dict:
+    """
+    Parse a metadata.json, memoized on (path, mtime).
+    
+    The mtime is part of the key so edited files are re-read. The returned
+    dict is shared between callers and must not be mutated.
+    """
+    data = Path(path_str).read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def load_metadata(metadata_path: Path) -> dict:
+    """Load a metadata.json, reusing the parsed result while it is unchanged."""
+    return _load_metadata_cached(str(metadata_path), metadata_path.stat().st_mtime_ns)
+
+
+def _write_json(path: Path, obj: dict) -> None:
+    """Write obj as indented JSON straight to path, without an interim str."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
 
 def find_projects(base_path: Path) -> list[Path]:
     """Find all project directories."""
@@ -53,7 +96,7 @@ def load_sample_metadata(samples_path: Path) -> dict[str, dict]:
     for sample_dir in find_samples(samples_path):
         metadata_path = sample_dir / "metadata.json"
         if metadata_path.exists():
-            metadata = json.loads(metadata_path.read_text())
+            metadata = load_metadata(metadata_path)
             samples[metadata.get('name', sample_dir.name)] = metadata
     
     return samples
@@ -111,11 +154,11 @@ def migrate_project(
             
             # Also create empty conversation.json
             conversation_path = context_dir / "conversation.json"
-            conversation_path.write_text(json.dumps({
+            _write_json(conversation_path, {
                 "project_id": summary.project_id,
                 "turns": [],
                 "created_at": datetime.now().isoformat()
-            }, indent=2))
+            })
             
             # Save summary
             output_path = generator.save_summary(summary)
@@ -159,7 +202,7 @@ def migrate_sample(
         generator = SummaryGenerator(str(sample_path))
         
         # Custom generate for samples (different metadata structure)
-        metadata = json.loads((sample_path / "metadata.json").read_text())
+        metadata = load_metadata(sample_path / "metadata.json")
         files = generator._parse_source_files()
         patterns = generator._detect_patterns(files)
         
@@ -174,7 +217,7 @@ def migrate_sample(
             current_state='refined',  # Samples are complete
             features=FeatureSet(
                 from_template=[],
-                added=metadata.get('features', []),
+                added=list(metadata.get('features', [])),
                 planned=[]
             ),
             files=files,
@@ -210,6 +253,18 @@ def migrate_sample(
     return result
 
 
+async def _migrate_all(fn, paths: list[Path], *args) -> list[dict]:
+    """
+    Run a migrate_* function over many paths concurrently.
+    
+    Each migration is file I/O plus parsing, so it runs on a worker
+    thread; results come back in the order of ``paths``.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(fn, path, *args) for path in paths)
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Migrate projects to use context/ folders")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without writing files")
@@ -241,16 +296,12 @@ def main():
         sample_metadata = load_sample_metadata(samples_path)
         projects = find_projects(projects_path)
         
-        for project_path in projects:
-            result = migrate_project(project_path, sample_metadata, args.dry_run)
-            results["projects"].append(result)
-            
-            status_icon = {
-                "migrated": "✅",
-                "skipped": "⏭️",
-                "dry_run": "🔍",
-                "error": "❌"
-            }.get(result["status"], "❓")
+        results["projects"] = asyncio.run(
+            _migrate_all(migrate_project, projects, sample_metadata, args.dry_run)
+        )
+        
+        for result in results["projects"]:
+            status_icon = _STATUS_ICONS.get(result["status"], "❓")
             
             print(f"  {status_icon} {result['project']}: {result['message']}")
     
@@ -261,16 +312,12 @@ def main():
         
         samples = find_samples(samples_path)
         
-        for sample_path in samples:
-            result = migrate_sample(sample_path, args.dry_run)
-            results["samples"].append(result)
-            
-            status_icon = {
-                "migrated": "✅",
-                "skipped": "⏭️",
-                "dry_run": "🔍",
-                "error": "❌"
-            }.get(result["status"], "❓")
+        results["samples"] = asyncio.run(
+            _migrate_all(migrate_sample, samples, args.dry_run)
+        )
+        
+        for result in results["samples"]:
+            status_icon = _STATUS_ICONS.get(result["status"], "❓")
             
             print(f"  {status_icon} {result['sample']}: {result['message']}")
     
@@ -5,13 +5,19 @@ Defines the data structures for project summaries - the JSON-based
 context that agents use to understand a project's current state.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+@dataclass(slots=True)
 class FunctionInfo:
     """Information about a function in a source file."""
     name: str
@@ -20,9 +26,19 @@ class FunctionInfo:
     description: str = ""
     line_start: int = 0
     line_end: int = 0
+    
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "return_type": self.return_type,
+            "parameters": self.parameters,
+            "description": self.description,
+            "line_start": self.line_start,
+            "line_end": self.line_end
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class StructInfo:
     """Information about a struct/typedef in a source file."""
     name: str
@@ -30,17 +46,29 @@ class StructInfo:
     description: str = ""
     line_start: int = 0
     line_end: int = 0
+    
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "fields": self.fields,
+            "description": self.description,
+            "line_start": self.line_start,
+            "line_end": self.line_end
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstantInfo:
     """Information about a #define constant."""
     name: str
     value: str
     comment: str = ""
+    
+    def to_dict(self) -> dict:
+        return {"name": self.name, "value": self.value, "comment": self.comment}
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     """Information about a source file in the project."""
     path: str
@@ -50,9 +78,32 @@ class FileInfo:
     constants: list[ConstantInfo] = field(default_factory=list)
     includes: list[str] = field(default_factory=list)
     lines: int = 0
+    
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "description": self.description,
+            "structs": [s.to_dict() for s in self.structs],
+            "functions": [f.to_dict() for f in self.functions],
+            "constants": [c.to_dict() for c in self.constants],
+            "includes": self.includes,
+            "lines": self.lines
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FileInfo':
+        """Create from dictionary, converting nested structs/functions/constants."""
+        data = dict(data)
+        if 'structs' in data:
+            data['structs'] = [StructInfo(**s) if isinstance(s, dict) else s for s in data['structs']]
+        if 'functions' in data:
+            data['functions'] = [FunctionInfo(**fn) if isinstance(fn, dict) else fn for fn in data['functions']]
+        if 'constants' in data:
+            data['constants'] = [ConstantInfo(**c) if isinstance(c, dict) else c for c in data['constants']]
+        return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class KnownIssue:
     """A known issue or bug in the project."""
     description: str
@@ -60,17 +111,33 @@ class KnownIssue:
     source: str  # "human_feedback", "build_error", "runtime"
     timestamp: str
     resolved: bool = False
+    
+    def to_dict(self) -> dict:
+        return {
+            "description": self.description,
+            "severity": self.severity,
+            "source": self.source,
+            "timestamp": self.timestamp,
+            "resolved": self.resolved
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureSet:
     """Features in the project, split by origin."""
     from_template: list[str] = field(default_factory=list)
     added: list[str] = field(default_factory=list)
     planned: list[str] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        return {
+            "from_template": self.from_template,
+            "added": self.added,
+            "planned": self.planned
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSummary:
     """
     Complete summary of a project's current state.
@@ -113,13 +180,43 @@ class ProjectSummary:
     summary_generated_at: str = ""
     
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Leaf lists are shared with the summary rather than deep-copied.
+        """
+        return {
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "description": self.description,
+            "template_source": self.template_source,
+            "template_name": self.template_name,
+            "current_state": self.current_state,
+            "features": self.features.to_dict(),
+            "files": [f.to_dict() for f in self.files],
+            "patterns": self.patterns,
+            "known_issues": [i.to_dict() for i in self.known_issues],
+            "last_build_success": self.last_build_success,
+            "last_build_error": self.last_build_error,
+            "rom_size_bytes": self.rom_size_bytes,
+            "created_at": self.created_at,
+            "last_updated": self.last_updated,
+            "summary_generated_at": self.summary_generated_at
+        }
     
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string."""
+        # orjson only supports two-space indentation
+        if ORJSON_AVAILABLE and indent == 2:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode()
         return json.dumps(self.to_dict(), indent=indent)
     
+    def to_json_bytes(self) -> bytes:
+        """Convert to UTF-8 encoded JSON, ready to write to a file."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        return json.dumps(self.to_dict(), indent=2).encode()
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'ProjectSummary':
         """Create from dictionary."""
@@ -128,20 +225,10 @@ class ProjectSummary:
             data['features'] = FeatureSet(**data['features'])
         
         if 'files' in data:
-            files = []
-            for f in data['files']:
-                if isinstance(f, dict):
-                    # Convert nested structs/functions
-                    if 'structs' in f:
-                        f['structs'] = [StructInfo(**s) if isinstance(s, dict) else s for s in f['structs']]
-                    if 'functions' in f:
-                        f['functions'] = [FunctionInfo(**fn) if isinstance(fn, dict) else fn for fn in f['functions']]
-                    if 'constants' in f:
-                        f['constants'] = [ConstantInfo(**c) if isinstance(c, dict) else c for c in f['constants']]
-                    files.append(FileInfo(**f))
-                else:
-                    files.append(f)
-            data['files'] = files
+            data['files'] = [
+                FileInfo.from_dict(f) if isinstance(f, dict) else f
+                for f in data['files']
+            ]
         
         if 'known_issues' in data:
             data['known_issues'] = [
@@ -154,6 +241,8 @@ class ProjectSummary:
     @classmethod
     def from_json(cls, json_str: str) -> 'ProjectSummary':
         """Create from JSON string."""
+        if ORJSON_AVAILABLE:
+            return cls.from_dict(orjson.loads(json_str))
         return cls.from_dict(json.loads(json_str))
 
 
@@ -8,38 +8,63 @@ that agents can use to understand the project's current state.
 import os
 import re
 import json
+import bisect
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from typing import ClassVar, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from .schemas import (
     ProjectSummary, FileInfo, StructInfo, FunctionInfo, 
     ConstantInfo, KnownIssue, FeatureSet
 )
 
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_PARSE_MIN_FILES = 32
+
+# Bump when CParser output changes so stale parse cache entries are ignored
+PARSE_CACHE_VERSION = 3
+
+_NEWLINE = re.compile(b'\n')
+
+
+def _text(data: bytes) -> str:
+    """Decode a fragment captured from raw source bytes."""
+    return data.decode('utf-8', 'replace')
+
+
+def _normalize_newlines(content: bytes) -> bytes:
+    """Apply text-mode newline handling (CRLF and CR become LF)."""
+    if b'\r' in content:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return content
+
+
+def _newline_offsets(text: bytes) -> list[int]:
+    """Offsets of every newline in text, built once per file."""
+    return [m.start() for m in _NEWLINE.finditer(text)]
+
+
+def _pos_to_line(nl_offsets: list[int], pos: int) -> int:
+    """Number of newlines before pos (the line number, given a leading newline)."""
+    return bisect.bisect_left(nl_offsets, pos)
+
 
 class CParser:
     """Simple C source file parser for extracting structs, functions, constants."""
     
     # Regex patterns
-    INCLUDE_PATTERN = re.compile(r'#include\s*[<"]([^>"]+)[>"]')
-    DEFINE_PATTERN = re.compile(r'#define\s+(\w+)\s+(.+?)(?:\s*//\s*(.*))?$', re.MULTILINE)
     STRUCT_PATTERN = re.compile(
         r'(?:typedef\s+)?struct\s+(\w+)?\s*\{([^}]+)\}\s*(\w+)?;',
         re.DOTALL
     )
-    TYPEDEF_STRUCT_PATTERN = re.compile(
-        r'typedef\s+struct\s*\{([^}]+)\}\s*(\w+);',
-        re.DOTALL
-    )
-    ENUM_PATTERN = re.compile(
-        r'typedef\s+enum\s*\{([^}]+)\}\s*(\w+);',
-        re.DOTALL
-    )
-    FUNCTION_PATTERN = re.compile(
-        r'^(\w+(?:\s*\*)?)\s+(\w+)\s*\(([^)]*)\)\s*\{',
-        re.MULTILINE
-    )
     FUNCTION_DECL_PATTERN = re.compile(
         r'^(\w+(?:\s*\*)?)\s+(\w+)\s*\(([^)]*)\);',
         re.MULTILINE
@@ -48,6 +73,31 @@ class CParser:
         r'/\*\*\s*\n\s*\*\s*@brief\s+(.+?)\n.*?\*/',
         re.DOTALL
     )
+    # Struct field: type name; or type name; // comment
+    FIELD_PATTERN: ClassVar[re.Pattern[bytes]] = re.compile(rb'(\w++(?:\s*\*)?)\s+(\w++)(?:\[[\d\w]++\])?;(?:\s*+//\s*(.*))?')
+    
+    # Everything parse_file extracts, fused into one alternation so a file is
+    # scanned once. Every branch starts with a literal ('\n', 't', '#', '@'),
+    # which lets the regex engine skip ahead to candidate positions. Function
+    # definitions are anchored on the preceding newline rather than '^' to
+    # keep that property, so the pattern runs over b'\n' + content. Source is
+    # scanned as raw bytes and only the captured fragments are decoded.
+    # Linear-time engines were tried here: google-re2 lacks lookahead and ran
+    # this scan about 2x slower than sre on the games/ sources, since its
+    # per-match overhead outweighs the DFA once sre can skip by prefix.
+    # Instead, runs whose quantifier can never overlap the token that follows
+    # are possessive (*+, ++), so a failed match can't backtrack through them,
+    # and a #define's trailing // comment is split off in Python rather than
+    # by a lazy value group (quadratic on long whitespace runs).
+    MASTER_PATTERN: ClassVar[re.Pattern[bytes]] = re.compile(
+        rb'\n(?P<fn_type>\w++(?:\s*\*)?)\s+(?P<fn_name>\w++)\s*+\((?P<fn_params>[^)]*+)\)\s*+\{'
+        rb'|typedef\s++(?:struct\s*+\{(?P<struct_body>[^}]++)\}\s*+(?P<struct_name>\w++)'
+        rb'|enum\s*+\{(?P<enum_body>[^}]++)\}\s*+(?P<enum_name>\w++));'
+        rb'|#(?:include\s*+[<"](?P<include>[^>"]++)[>"]'
+        rb'|define\s++(?P<define_name>\w++)[ \t]+(?P<define_rest>.++))'
+        rb'|@(?:brief\s+(?P<brief>.+?)|game\s+(?P<game>.+?))(?=\n|\*)',
+        re.MULTILINE
+    )
     
     @classmethod
     def parse_file(cls, filepath: str) -> FileInfo:
@@ -55,30 +105,110 @@ class CParser:
         path = Path(filepath)
         
         try:
-            content = path.read_text()
+            content = path.read_bytes()
         except Exception as e:
-            return FileInfo(
-                path=str(path.name),
-                description=f"Error reading file: {e}",
-                lines=0
-            )
+            return cls._read_error(path.name, e)
         
-        lines = content.split('\n')
-        line_count = len(lines)
-        
-        # Extract components
-        includes = cls._extract_includes(content)
-        constants = cls._extract_constants(content)
-        structs = cls._extract_structs(content)
-        functions = cls._extract_functions(content, lines)
+        return cls.parse_content(path.name, content)
+    
+    @staticmethod
+    def _read_error(name: str, error: Exception) -> FileInfo:
+        """Build the FileInfo reported for a file that could not be read."""
+        return FileInfo(
+            path=name,
+            description=f"Error reading file: {error}",
+            lines=0
+        )
+    
+    @classmethod
+    def parse_content(cls, name: str, content: bytes) -> FileInfo:
+        """
+        Parse the raw bytes of a C source file and extract its components.
         
-        # Try to extract file description from doc comment
-        description = cls._extract_file_description(content)
+        Args:
+            name: File name recorded in the returned FileInfo
+            content: File contents as read from disk
+            
+        Returns:
+            Parsed FileInfo
+        """
+        content = _normalize_newlines(content)
+        
+        # With the leading newline, the count of newlines before pos is the
+        # 1-based line number of pos, and the offset count is the line count
+        text = b'\n' + content
+        nl_offsets = _newline_offsets(text)
+        line_count = len(nl_offsets)
+        
+        includes = []
+        constants = []
+        structs = []
+        enums = []
+        functions = []
+        brief = None
+        game = None
+        
+        # Extract components in a single pass
+        for match in cls.MASTER_PATTERN.finditer(text):
+            if match['fn_name'] is not None:
+                # Skip common false positives
+                if match['fn_name'] in (b'if', b'while', b'for', b'switch'):
+                    continue
+                functions.append(cls._function_from_match(text, nl_offsets, match))
+            elif match['define_name'] is not None:
+                macro, rest = match['define_name'], match['define_rest']
+                # The value runs up to the first // (it is at least one byte)
+                cut = rest.find(b'//', 1)
+                if cut == -1:
+                    value, comment = rest, None
+                else:
+                    value, comment = rest[:cut], rest[cut + 2:].lstrip()
+                # Skip include guards and function-like macros
+                if macro.endswith(b'_H') or b'(' in value:
+                    continue
+                constants.append(ConstantInfo(
+                    name=_text(macro),
+                    value=_text(value).strip(),
+                    comment=_text(comment) if comment else ""
+                ))
+            elif match['include'] is not None:
+                includes.append(_text(match['include']))
+            elif match['struct_name'] is not None:
+                structs.append(StructInfo(
+                    name=_text(match['struct_name']),
+                    fields=cls._parse_struct_fields(match['struct_body']),
+                    description="",
+                    line_start=_pos_to_line(nl_offsets, match.start()),
+                    line_end=_pos_to_line(nl_offsets, match.end())
+                ))
+            elif match['enum_name'] is not None:
+                values = [v.strip().split('=')[0].strip() 
+                         for v in _text(match['enum_body']).split(',') if v.strip()]
+                enums.append(StructInfo(
+                    name=_text(match['enum_name']),
+                    fields=[{"name": v, "type": "enum_value", "comment": ""} for v in values if v],
+                    description="Enum type",
+                    line_start=_pos_to_line(nl_offsets, match.start()),
+                    line_end=_pos_to_line(nl_offsets, match.end())
+                ))
+            elif match['brief'] is not None:
+                if brief is None:
+                    brief = _text(match['brief']).strip()
+            elif game is None:
+                game = _text(match['game']).strip()
+        
+        # File description comes from @brief, falling back to @game
+        if brief is not None:
+            description = brief
+        elif game is not None:
+            description = f"Game: {game}"
+        else:
+            description = ""
         
         return FileInfo(
-            path=f"src/{path.name}",
+            path=f"src/{name}",
             description=description,
-            structs=structs,
+            structs=structs + enums,
             functions=functions,
             constants=constants,
             includes=includes,
@@ -86,136 +216,82 @@ class CParser:
         )
     
     @classmethod
-    def _extract_includes(cls, content: str) -> list[str]:
-        """Extract #include directives."""
-        return cls.INCLUDE_PATTERN.findall(content)
-    
-    @classmethod
-    def _extract_constants(cls, content: str) -> list[ConstantInfo]:
-        """Extract #define constants."""
-        constants = []
-        for match in cls.DEFINE_PATTERN.finditer(content):
-            name, value, comment = match.groups()
-            # Skip include guards and function-like macros
-            if name.endswith('_H') or '(' in value:
-                continue
-            constants.append(ConstantInfo(
-                name=name,
-                value=value.strip(),
-                comment=comment or ""
-            ))
-        return constants
-    
-    @classmethod
-    def _extract_structs(cls, content: str) -> list[StructInfo]:
-        """Extract struct definitions."""
-        structs = []
-        
-        # Handle typedef struct { ... } Name;
-        for match in cls.TYPEDEF_STRUCT_PATTERN.finditer(content):
-            body, name = match.groups()
-            fields = cls._parse_struct_fields(body)
-            structs.append(StructInfo(
-                name=name,
-                fields=fields,
-                description="",
-                line_start=content[:match.start()].count('\n') + 1,
-                line_end=content[:match.end()].count('\n') + 1
-            ))
-        
-        # Handle typedef enum { ... } Name;
-        for match in cls.ENUM_PATTERN.finditer(content):
-            body, name = match.groups()
-            values = [v.strip().split('=')[0].strip() 
-                     for v in body.split(',') if v.strip()]
-            structs.append(StructInfo(
-                name=name,
-                fields=[{"name": v, "type": "enum_value", "comment": ""} for v in values if v],
-                description="Enum type",
-                line_start=content[:match.start()].count('\n') + 1,
-                line_end=content[:match.end()].count('\n') + 1
-            ))
-        
-        return structs
-    
-    @classmethod
-    def _parse_struct_fields(cls, body: str) -> list[dict]:
+    def _parse_struct_fields(cls, body: bytes) -> list[dict]:
         """Parse fields from a struct body."""
         fields = []
-        # Simple field pattern: type name; or type name; // comment
-        field_pattern = re.compile(r'(\w+(?:\s*\*)?)\s+(\w+)(?:\[[\d\w]+\])?;(?:\s*//\s*(.*))?')
         
-        for match in field_pattern.finditer(body):
+        for match in cls.FIELD_PATTERN.finditer(body):
             field_type, name, comment = match.groups()
             fields.append({
-                "name": name,
-                "type": field_type.strip(),
-                "comment": comment or ""
+                "name": _text(name),
+                "type": _text(field_type).strip(),
+                "comment": _text(comment) if comment else ""
             })
         
         return fields
     
     @classmethod
-    def _extract_functions(cls, content: str, lines: list[str]) -> list[FunctionInfo]:
-        """Extract function definitions."""
-        functions = []
-        
-        # Find function definitions (with body)
-        for match in cls.FUNCTION_PATTERN.finditer(content):
-            return_type, name, params = match.groups()
-            
-            # Skip common false positives
-            if name in ('if', 'while', 'for', 'switch'):
-                continue
-            
-            line_start = content[:match.start()].count('\n') + 1
-            
-            # Find the end of the function (matching braces)
-            line_end = cls._find_function_end(content, match.end())
-            
-            # Parse parameters
-            param_list = [p.strip() for p in params.split(',') if p.strip()]
-            
-            functions.append(FunctionInfo(
-                name=name,
-                return_type=return_type.strip(),
-                parameters=param_list,
-                description="",
-                line_start=line_start,
-                line_end=line_end
-            ))
-        
-        return functions
+    def _function_from_match(
+        cls, 
+        text: bytes, 
+        nl_offsets: list[int], 
+        match: re.Match
+    ) -> FunctionInfo:
+        """Build a FunctionInfo from a MASTER_PATTERN function match."""
+        line_start = _pos_to_line(nl_offsets, match.start('fn_type'))
+        
+        # Find the end of the function (matching braces)
+        line_end = cls._find_function_end(text, match.end(), nl_offsets)
+        
+        # Parse parameters
+        param_list = [p.strip() for p in _text(match['fn_params']).split(',') if p.strip()]
+        
+        return FunctionInfo(
+            name=_text(match['fn_name']),
+            return_type=_text(match['fn_type']).strip(),
+            parameters=param_list,
+            description="",
+            line_start=line_start,
+            line_end=line_end
+        )
     
     @classmethod
-    def _find_function_end(cls, content: str, start_pos: int) -> int:
-        """Find the line number where a function ends."""
+    def _find_function_end(cls, text: bytes, start_pos: int, nl_offsets: list[int]) -> int:
+        """Find the line number where a function ends (b'\n' + content)."""
         brace_count = 1
-        pos = start_pos
-        
-        while pos < len(content) and brace_count > 0:
-            if content[pos] == '{':
+        next_open = text.find(b'{', start_pos)
+        next_close = text.find(b'}', start_pos)
+        
+        # Jump brace to brace with find rather than stepping per character
+        while True:
+            if next_close == -1:
+                # Unbalanced braces run to the end of the file
+                pos = len(text)
+                break
+            if next_open != -1 and next_open < next_close:
                 brace_count += 1
-            elif content[pos] == '}':
+                next_open = text.find(b'{', next_open + 1)
+            else:
                 brace_count -= 1
-            pos += 1
+                pos = next_close + 1
+                if brace_count == 0:
+                    break
+                next_close = text.find(b'}', pos)
         
-        return content[:pos].count('\n') + 1
+        return _pos_to_line(nl_offsets, pos)
+
+
+def _parse_files(paths: list[str]) -> list[FileInfo]:
+    """
+    Parse many source files, returning FileInfos in the order of paths.
     
-    @classmethod
-    def _extract_file_description(cls, content: str) -> str:
-        """Extract file description from doc comment."""
-        # Look for @file and @brief in the header
-        brief_match = re.search(r'@brief\s+(.+?)(?:\n|\*)', content)
-        if brief_match:
-            return brief_match.group(1).strip()
-        
-        # Look for @game tag
-        game_match = re.search(r'@game\s+(.+?)(?:\n|\*)', content)
-        if game_match:
-            return f"Game: {game_match.group(1).strip()}"
-        
-        return ""
+    Parsing is CPU-bound regex work, so large batches are spread across
+    processes. Typical projects have a handful of files and parse inline.
+    """
+    if len(paths) < PARALLEL_PARSE_MIN_FILES:
+        return [CParser.parse_file(path) for path in paths]
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(CParser.parse_file, paths, chunksize=4))
 
 
 class SummaryGenerator:
@@ -226,6 +302,10 @@ class SummaryGenerator:
         self.src_path = self.project_path / "src"
         self.metadata_path = self.project_path / "metadata.json"
         self.plan_path = self.project_path / "plan.json"
+        self.parse_cache_path = self.project_path / "context" / ".parse_cache.json"
+        
+        # Parsed JSON files by path, reused while their mtime is unchanged
+        self._json_cache: dict[Path, tuple[int, object]] = {}
         
     def generate(self, template_metadata: Optional[dict] = None) -> ProjectSummary:
         """Generate a complete project summary."""
@@ -273,80 +353,164 @@ class SummaryGenerator:
             summary_generated_at=datetime.now().isoformat()
         )
     
+    def _load_json(self, path: Path):
+        """
+        Parse a JSON file, or return None if it doesn't exist.
+        
+        The result is reused until the file's mtime changes, so callers
+        must treat it as read-only.
+        """
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        data = path.read_bytes()
+        parsed = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        self._json_cache[path] = (mtime_ns, parsed)
+        return parsed
+    
     def _load_metadata(self) -> dict:
         """Load project metadata.json."""
-        if self.metadata_path.exists():
-            return json.loads(self.metadata_path.read_text())
-        return {}
+        metadata = self._load_json(self.metadata_path)
+        return {} if metadata is None else metadata
     
     def _load_plan(self) -> Optional[dict]:
         """Load project plan.json."""
-        if self.plan_path.exists():
-            return json.loads(self.plan_path.read_text())
-        return None
+        return self._load_json(self.plan_path)
+    
+    def _source_entries(self) -> list[os.DirEntry]:
+        """List src/ sources in one directory read: .c then .h, each by name."""
+        try:
+            with os.scandir(self.src_path) as it:
+                sources = [
+                    e for e in it
+                    if e.name.endswith(('.c', '.h')) and e.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+        sources.sort(key=lambda e: (e.name.endswith('.h'), e.name))
+        return sources
     
     def _parse_source_files(self) -> list[FileInfo]:
         """Parse all source files in the project."""
-        files = []
-        
-        if not self.src_path.exists():
-            return files
-        
-        c_files = list(self.src_path.glob('*.c'))
-        h_files = list(self.src_path.glob('*.h'))
-        
-        for src_file in sorted(c_files) + sorted(h_files):
-            file_info = CParser.parse_file(str(src_file))
-            files.append(file_info)
-        
-        return files
+        sources = self._source_entries()
+        
+        # Reuse cached parses of files whose mtime and size are unchanged;
+        # the rest are parsed together below
+        cache = self._load_parse_cache()
+        entries = {}
+        cached: list[Optional[FileInfo]] = []  # None where a parse is needed
+        misses: list[tuple[os.DirEntry, Optional[os.stat_result]]] = []
+        
+        for src in sources:
+            try:
+                st: Optional[os.stat_result] = src.stat()
+            except OSError:
+                st = None
+            
+            entry = cache.get(src.name)
+            if entry and st and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                entries[src.name] = entry
+                cached.append(FileInfo.from_dict(entry['info']))
+            else:
+                misses.append((src, st))
+                cached.append(None)
+        
+        parsed = _parse_files([src.path for src, _ in misses])
+        for (src, st), file_info in zip(misses, parsed):
+            # lines == 0 means the read failed; don't remember that
+            if st is not None and file_info.lines:
+                entries[src.name] = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "info": file_info.to_dict()
+                }
+        
+        if misses or len(entries) != len(cache):
+            self._save_parse_cache(entries)
+        
+        fresh = iter(parsed)
+        return [info if info is not None else next(fresh) for info in cached]
+    
+    def _load_parse_cache(self) -> dict:
+        """Load cached per-file parses, keyed by file name."""
+        try:
+            data = json.loads(self.parse_cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != PARSE_CACHE_VERSION:
+            return {}
+        return data.get('files') or {}
+    
+    def _save_parse_cache(self, entries: dict) -> None:
+        """Persist per-file parses next to summary.json (only once context/ exists)."""
+        if not self.parse_cache_path.parent.is_dir():
+            return
+        try:
+            self.parse_cache_path.write_text(json.dumps({
+                "version": PARSE_CACHE_VERSION,
+                "files": entries
+            }))
+        except OSError:
+            pass
     
     def _detect_patterns(self, files: list[FileInfo]) -> list[str]:
         """Detect code patterns from parsed files."""
         patterns = []
         
         # Collect all struct names, function names, constants
-        all_structs = set()
-        all_functions = set()
-        all_constants = set()
+        all_structs: set[str] = set()
+        all_functions: set[str] = set()
+        all_constants: set[str] = set()
         
         for f in files:
             all_structs.update(s.name for s in f.structs)
             all_functions.update(fn.name for fn in f.functions)
             all_constants.update(c.name for c in f.constants)
         
+        # Newline-joined names turn each "any name contains X" rule into one
+        # C-level substring search (names never contain a newline)
+        consts_blob = '\n'.join(all_constants)
+        consts_blob_lower = consts_blob.lower()
+        funcs_blob_lower = '\n'.join(all_functions).lower()
+        
         # Pattern detection rules
         if 'GameState' in all_structs or 'GameStateType' in all_structs:
             patterns.append('state_machine')
         
-        if any('velocity' in c.lower() for c in all_constants):
+        if 'velocity' in consts_blob_lower:
             patterns.append('physics')
         
-        if any('SPRITE_' in c for c in all_constants):
+        if 'SPRITE_' in consts_blob:
             patterns.append('sprites')
         
-        if any('TILE_' in c for c in all_constants):
+        if 'TILE_' in consts_blob:
             patterns.append('tiles')
         
-        if 'update_ai' in all_functions or 'ai_' in ' '.join(all_functions).lower():
+        if 'update_ai' in all_functions or 'ai_' in funcs_blob_lower:
             patterns.append('ai')
         
-        if any('collision' in fn.lower() for fn in all_functions):
+        if 'collision' in funcs_blob_lower:
             patterns.append('collision')
         
-        if any('score' in c.lower() for c in all_constants) or 'update_score' in all_functions:
+        if 'score' in consts_blob_lower or 'update_score' in all_functions:
             patterns.append('scoring')
         
-        if any('PADDLE' in c for c in all_constants):
+        if 'PADDLE' in consts_blob:
             patterns.append('paddle')
         
-        if any('BALL' in c for c in all_constants):
+        if 'BALL' in consts_blob:
             patterns.append('ball_physics')
         
-        if any('GRAVITY' in c for c in all_constants):
+        if 'GRAVITY' in consts_blob:
             patterns.append('gravity')
         
-        if any('JUMP' in c for c in all_constants):
+        if 'JUMP' in consts_blob:
             patterns.append('jumping')
         
         return patterns
@@ -358,24 +522,24 @@ class SummaryGenerator:
         template_metadata: Optional[dict]
     ) -> FeatureSet:
         """Extract features from metadata and plan."""
-        from_template = []
-        added = []
-        planned = []
+        from_template: list[str] = []
+        added: list[str] = []
+        planned: list[str] = []
         
         # If we have a template, its features are "from_template"
         if template_metadata:
-            from_template = template_metadata.get('features', []) or []
+            from_template = list(template_metadata.get('features', []) or [])
         
-        # Features from plan are "added"
+        # Features from plan are "added" (deduped, keeping plan order)
         if plan:
             steps = plan.get('steps') or []
-            for step in steps:
-                features = step.get('features_added') or []
-                added.extend(features)
+            added = list(dict.fromkeys(chain.from_iterable(
+                step.get('features_added') or () for step in steps
+            )))
         
         return FeatureSet(
             from_template=from_template,
-            added=list(set(added)),  # dedupe
+            added=added,
             planned=planned
         )
     
@@ -431,23 +595,26 @@ class SummaryGenerator:
     
     def _get_rom_size(self) -> int:
         """Get the ROM file size if it exists."""
-        build_path = self.project_path / "build"
-        if build_path.exists():
-            for rom in build_path.glob('*.gb'):
-                return rom.stat().st_size
+        try:
+            with os.scandir(self.project_path / "build") as it:
+                for entry in it:
+                    if entry.name.endswith('.gb') and entry.is_file():
+                        return entry.stat().st_size
+        except (FileNotFoundError, NotADirectoryError):
+            pass
         return 0
     
-    def save_summary(self, summary: ProjectSummary, output_path: Optional[str] = None):
+    def save_summary(self, summary: ProjectSummary, output_path: Optional[str] = None) -> Path:
         """Save the summary to a JSON file."""
         if output_path is None:
             context_dir = self.project_path / "context"
             context_dir.mkdir(exist_ok=True)
-            output_path = context_dir / "summary.json"
+            path = context_dir / "summary.json"
         else:
-            output_path = Path(output_path)
+            path = Path(output_path)
         
-        output_path.write_text(summary.to_json())
-        return output_path
+        path.write_bytes(summary.to_json_bytes())
+        return path
 
 
 def generate_summary(project_path: str, template_metadata: Optional[dict] = None) -> ProjectSummary:
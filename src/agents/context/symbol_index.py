@@ -14,23 +14,79 @@ This allows the Coder to understand the codebase structure and request
 only the specific files needed for a given step.
 """
 
+import os
 import re
+import sys
 import json
+import bisect
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional
 
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_PARSE_MIN_FILES = 32
 
-@dataclass
+# Bump when _parse_file output changes so stale symbol cache entries are ignored
+SYMBOL_CACHE_VERSION = 2
+
+_NEWLINE = re.compile(b'\n')
+
+# Comments and string/char literals; an unterminated block comment runs to EOF
+_NOISE = re.compile(
+    rb'//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'',
+    re.DOTALL
+)
+_NOT_NEWLINE = re.compile(rb'[^\n]')
+
+
+def _text(data: bytes) -> str:
+    """Decode a fragment captured from raw source bytes."""
+    return data.decode('utf-8', 'replace')
+
+
+def _blank_noise(match: re.Match) -> bytes:
+    """Blank a comment entirely, or a literal's contents between its quotes."""
+    noise = match.group()
+    if noise[:1] == b'/':
+        return _NOT_NEWLINE.sub(b' ', noise)
+    return noise[:1] + b' ' * (len(noise) - 2) + noise[-1:]
+
+
+def _strip_noise(content: bytes) -> bytes:
+    """
+    Blank out comments and string/char literal contents.
+    
+    The result has the same length and newlines as content, so offsets
+    and line numbers found in it apply to the original text.
+    """
+    return _NOISE.sub(_blank_noise, content)
+
+
+def _newline_offsets(content: bytes) -> list[int]:
+    """Offsets of every newline in content, built once per file."""
+    return [m.start() for m in _NEWLINE.finditer(content)]
+
+
+def _offset_to_line(newline_offsets: list[int], pos: int) -> int:
+    """1-based line number of the character at pos."""
+    return bisect.bisect_left(newline_offsets, pos) + 1
+
+
+@dataclass(slots=True)
 class StructSymbol:
     """A struct or enum definition."""
     name: str
     kind: str  # "struct" or "enum"
     fields: list[str]  # field names only for brevity
     line: int
+    
+    def to_dict(self) -> dict:
+        return {"name": self.name, "kind": self.kind, "fields": self.fields, "line": self.line}
 
 
-@dataclass 
+@dataclass(slots=True)
 class FunctionSymbol:
     """A function declaration or implementation."""
     name: str
@@ -40,16 +96,29 @@ class FunctionSymbol:
     is_definition: bool  # True if has body, False if just declaration
     calls: list[str] = field(default_factory=list)  # Functions this calls
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "return_type": self.return_type,
+            "params": self.params,
+            "line": self.line,
+            "is_definition": self.is_definition,
+            "calls": self.calls
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ConstantSymbol:
     """A #define constant."""
     name: str
     value: str
     line: int
+    
+    def to_dict(self) -> dict:
+        return {"name": self.name, "value": self.value, "line": self.line}
 
 
-@dataclass
+@dataclass(slots=True)
 class FileSymbols:
     """Symbols extracted from a single file."""
     path: str
@@ -59,6 +128,42 @@ class FileSymbols:
     structs: list[StructSymbol] = field(default_factory=list)
     functions: list[FunctionSymbol] = field(default_factory=list)
     constants: list[ConstantSymbol] = field(default_factory=list)
+    # Bare filename of each include, e.g. "gb.h" for <gb/gb.h>
+    include_basenames: list[str] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        """Convert to the full dict form stored in the symbol cache."""
+        return {
+            "path": self.path,
+            "file_type": self.file_type,
+            "lines": self.lines,
+            "includes": self.includes,
+            "structs": [s.to_dict() for s in self.structs],
+            "functions": [f.to_dict() for f in self.functions],
+            "constants": [c.to_dict() for c in self.constants],
+            "include_basenames": self.include_basenames
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FileSymbols':
+        """Rebuild from the to_dict() form stored in the symbol cache."""
+        return cls(
+            path=data['path'],
+            file_type=data['file_type'],
+            lines=data['lines'],
+            includes=data['includes'],
+            structs=[StructSymbol(**s) for s in data['structs']],
+            functions=[
+                FunctionSymbol(**{
+                    **f,
+                    'name': sys.intern(f['name']),
+                    'calls': [sys.intern(c) for c in f['calls']]
+                })
+                for f in data['functions']
+            ],
+            constants=[ConstantSymbol(**c) for c in data['constants']],
+            include_basenames=data['include_basenames']
+        )
     
     def to_compact_dict(self) -> dict:
         """Convert to a compact dict representation for JSON."""
@@ -69,7 +174,7 @@ class FileSymbols:
         
         if self.includes:
             # Just the filenames, not full paths
-            result["includes"] = [inc.split("/")[-1].strip('"<>') for inc in self.includes]
+            result["includes"] = self.include_basenames
         
         if self.structs:
             result["structs"] = {
@@ -78,9 +183,11 @@ class FileSymbols:
             }
         
         if self.functions:
-            # Separate declarations from implementations
-            decls = [f.name for f in self.functions if not f.is_definition]
-            impls = [f.name for f in self.functions if f.is_definition]
+            # Separate declarations from implementations in one pass
+            decls = []
+            impls = []
+            for f in self.functions:
+                (impls if f.is_definition else decls).append(f.name)
             
             if decls:
                 result["declares"] = decls
@@ -94,7 +201,7 @@ class FileSymbols:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CallGraphEntry:
     """Call graph entry for a function."""
     defined_in: str
@@ -102,74 +209,112 @@ class CallGraphEntry:
     called_by: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolIndex:
     """Complete symbol index for a project."""
     files: dict[str, FileSymbols] = field(default_factory=dict)
     call_graph: dict[str, CallGraphEntry] = field(default_factory=dict)
     
+    # (deps, reverse_deps) built from files, cleared by add_file
+    _deps_cache: Optional[tuple[dict[str, list[str]], dict[str, list[str]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def add_file(self, symbols: FileSymbols) -> None:
+        """Add a file's symbols, invalidating derived caches."""
+        self.files[symbols.path] = symbols
+        self._deps_cache = None
+    
     def to_dict(self) -> dict:
         """Convert to dict for JSON serialization."""
-        return {
-            "files": {
-                path: symbols.to_compact_dict()
-                for path, symbols in self.files.items()
-            },
-            "call_graph": {
-                func: {
+        files = {}
+        for path, symbols in self.files.items():
+            files[path] = symbols.to_compact_dict()
+        
+        call_graph = {}
+        for func, entry in self.call_graph.items():
+            # Only include if has relationships
+            if entry.calls or entry.called_by:
+                call_graph[func] = {
                     "in": entry.defined_in.replace("src/", ""),
                     "calls": entry.calls,
                     "called_by": entry.called_by
                 }
-                for func, entry in self.call_graph.items()
-                if entry.calls or entry.called_by  # Only include if has relationships
-            },
+        
+        return {
+            "files": files,
+            "call_graph": call_graph,
             "dependencies": self._build_dependency_graph()
         }
     
     def _build_dependency_graph(self) -> dict[str, list[str]]:
         """Build file dependency graph from includes."""
+        return self._dependency_graphs()[0]
+    
+    def _dependency_graphs(self) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        """
+        Build the dependency graph and its reverse (cached until add_file).
+        
+        Returns:
+            (deps, reverse_deps): files each file includes, and files
+            that include each file
+        """
+        if self._deps_cache is not None:
+            return self._deps_cache
+        
+        # Every project file lives directly under src/, so an include
+        # resolves to a local file by basename alone
+        by_basename = {path.rsplit("/", 1)[-1]: path for path in self.files}
+        
         deps = {}
         for path, symbols in self.files.items():
             # Find which local files this file includes
-            local_deps = []
-            for inc in symbols.includes:
-                # Match against our known files
-                inc_name = inc.strip('"<>').split("/")[-1]
-                for other_path in self.files.keys():
-                    if other_path.endswith(inc_name):
-                        local_deps.append(other_path)
-                        break
+            local_deps = [
+                by_basename[name] for name in symbols.include_basenames
+                if name in by_basename
+            ]
             if local_deps:
                 deps[path] = local_deps
-        return deps
+        
+        reverse_deps = {}
+        for path, local_deps in deps.items():
+            for dep in local_deps:
+                reverse_deps.setdefault(dep, []).append(path)
+        
+        self._deps_cache = (deps, reverse_deps)
+        return self._deps_cache
     
     def to_prompt_format(self) -> str:
         """Format symbol index for LLM prompt - compact but readable."""
         lines = ["## Project Symbol Index", ""]
         
-        # Group by file type
-        headers = {p: s for p, s in self.files.items() if s.file_type == "header"}
-        impls = {p: s for p, s in self.files.items() if s.file_type == "implementation"}
+        # Group by file type, sorting the paths once
+        headers = []
+        impls = []
+        for path in sorted(self.files):
+            symbols = self.files[path]
+            if symbols.file_type == "header":
+                headers.append(self._format_file_symbols(path, symbols))
+            elif symbols.file_type == "implementation":
+                impls.append(self._format_file_symbols(path, symbols))
         
         # Headers first
         if headers:
             lines.append("### Headers")
-            for path, symbols in sorted(headers.items()):
-                lines.append(self._format_file_symbols(path, symbols))
+            lines.extend(headers)
             lines.append("")
         
         # Implementations
         if impls:
             lines.append("### Implementation Files")
-            for path, symbols in sorted(impls.items()):
-                lines.append(self._format_file_symbols(path, symbols))
+            lines.extend(impls)
             lines.append("")
         
         # Call graph (abbreviated)
         if self.call_graph:
             lines.append("### Key Function Relationships")
-            for func, entry in sorted(self.call_graph.items()):
+            for func in sorted(self.call_graph):
+                entry = self.call_graph[func]
                 if entry.calls:
                     calls_str = ", ".join(entry.calls[:5])
                     if len(entry.calls) > 5:
@@ -231,17 +376,11 @@ class SymbolIndex:
     
     def get_dependent_files(self, file_path: str) -> list[str]:
         """Get files that depend on or are depended by the given file."""
-        deps = self._build_dependency_graph()
-        result = set()
+        deps, reverse_deps = self._dependency_graphs()
         
-        # Files this one depends on
-        if file_path in deps:
-            result.update(deps[file_path])
-        
-        # Files that depend on this one
-        for other_file, other_deps in deps.items():
-            if file_path in other_deps:
-                result.add(other_file)
+        # Files this one depends on, and files that depend on this one
+        result = set(deps.get(file_path, ()))
+        result.update(reverse_deps.get(file_path, ()))
         
         return list(result)
 
@@ -249,41 +388,38 @@ class SymbolIndex:
 class SymbolIndexGenerator:
     """Generates symbol index by parsing C source files."""
     
-    # Regex patterns for parsing
-    INCLUDE_PATTERN = re.compile(r'#include\s*([<"][^>"]+[>"])')
-    DEFINE_PATTERN = re.compile(r'#define\s+(\w+)\s+(.+?)(?:\s*//.*)?$', re.MULTILINE)
-    
-    STRUCT_PATTERN = re.compile(
-        r'typedef\s+struct\s*(?:\w+)?\s*\{([^}]+)\}\s*(\w+);',
-        re.DOTALL
-    )
-    ENUM_PATTERN = re.compile(
-        r'typedef\s+enum\s*(?:\w+)?\s*\{([^}]+)\}\s*(\w+);',
-        re.DOTALL
+    # Everything _parse_file extracts apart from call sites, fused into one
+    # alternation so each file is scanned once. Function definitions and
+    # declarations share a branch and differ only in the terminator. The
+    # typedef branch stops at the opening brace; the body is found by brace
+    # matching so nested structs and unions are handled in linear time.
+    # Sources are scanned as raw bytes with ASCII classes, and only the
+    # captured fragments are decoded.
+    SYMBOL_PATTERN = re.compile(
+        rb'#include\s*(?P<include>[<"][^>"]+[>"])'
+        rb'|^#define[^\S\n]+(?P<define_name>\w+)[^\S\n]+(?P<define_value>.+?)(?:[^\S\n]*//.*)?$'
+        rb'|typedef\s+(?P<type_kind>struct|enum)\s*(?:\w+)?\s*\{'
+        rb'|^(?P<ret_type>\w[\w\s\*]*?)\s+(?P<func_name>\w+)\s*\((?P<params>[^)]*)\)\s*(?P<term>[{;])',
+        re.MULTILINE | re.ASCII
     )
     
-    # Function with body
-    FUNC_DEF_PATTERN = re.compile(
-        r'^(\w[\w\s\*]*?)\s+(\w+)\s*\(([^)]*)\)\s*\{',
-        re.MULTILINE
-    )
-    # Function declaration (no body)
-    FUNC_DECL_PATTERN = re.compile(
-        r'^(\w[\w\s\*]*?)\s+(\w+)\s*\(([^)]*)\)\s*;',
-        re.MULTILINE
-    )
+    # Type name after a typedef body's closing brace
+    TYPEDEF_NAME_PATTERN = re.compile(rb'\s*(\w+);', re.ASCII)
     
     # Function calls within code
-    FUNC_CALL_PATTERN = re.compile(r'\b(\w+)\s*\(')
+    FUNC_CALL_PATTERN = re.compile(rb'\b(\w+)\s*\(', re.ASCII)
+    
+    # Struct field: name; or name[size];
+    FIELD_PATTERN = re.compile(rb'(\w+)\s*(?:\[[^\]]*\])?\s*;', re.ASCII)
     
     # C keywords and common names to exclude from call detection
-    C_KEYWORDS = {
+    C_KEYWORDS = frozenset({
         'if', 'else', 'while', 'for', 'switch', 'case', 'return', 'break',
         'continue', 'sizeof', 'typedef', 'struct', 'enum', 'union', 'void',
         'static', 'extern', 'const', 'volatile', 'register', 'inline',
         'uint8_t', 'uint16_t', 'int8_t', 'int16_t', 'UINT8', 'UINT16',
         'INT8', 'INT16', 'TRUE', 'FALSE', 'NULL'
-    }
+    })
     
     def generate(self, project_path: Path) -> SymbolIndex:
         """Generate symbol index for a project."""
@@ -293,24 +429,85 @@ class SymbolIndexGenerator:
         if not src_path.exists():
             return index
         
-        # Parse all source files
-        for f in sorted(src_path.glob("*.h")):
-            symbols = self._parse_file(f, "header")
-            index.files[f"src/{f.name}"] = symbols
-        
-        for f in sorted(src_path.glob("*.c")):
-            symbols = self._parse_file(f, "implementation")
-            index.files[f"src/{f.name}"] = symbols
+        # Parse all source files, headers first
+        jobs = [(str(f), "header") for f in sorted(src_path.glob("*.h"))]
+        jobs += [(str(f), "implementation") for f in sorted(src_path.glob("*.c"))]
+        for symbols in self._parse_jobs(jobs, project_path / "context" / ".symbol_cache.json"):
+            index.add_file(symbols)
         
         # Build call graph
         index.call_graph = self._build_call_graph(index.files)
         
         return index
     
+    def _parse_jobs(self, jobs: list[tuple[str, str]], cache_path: Path) -> list[FileSymbols]:
+        """Parse (path, file_type) jobs, reusing cached parses of unchanged files."""
+        # Files whose mtime and size are unchanged come from the cache;
+        # the rest are parsed together below
+        cache = self._load_cache(cache_path)
+        entries = {}
+        cached: list[Optional[FileSymbols]] = []  # None where a parse is needed
+        misses: list[tuple[tuple[str, str], Optional[os.stat_result]]] = []
+        
+        for job in jobs:
+            name = os.path.basename(job[0])
+            try:
+                st: Optional[os.stat_result] = os.stat(job[0])
+            except OSError:
+                st = None
+            
+            entry = cache.get(name)
+            if entry and st and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                entries[name] = entry
+                cached.append(FileSymbols.from_dict(entry['symbols']))
+            else:
+                misses.append((job, st))
+                cached.append(None)
+        
+        parsed = _parse_files([job for job, _ in misses])
+        for (job, st), symbols in zip(misses, parsed):
+            # lines == 0 means the read failed; don't remember that
+            if st is not None and symbols.lines:
+                entries[os.path.basename(job[0])] = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "symbols": symbols.to_dict()
+                }
+        
+        if misses or len(entries) != len(cache):
+            self._save_cache(cache_path, entries)
+        
+        fresh = iter(parsed)
+        return [symbols if symbols is not None else next(fresh) for symbols in cached]
+    
+    def _load_cache(self, cache_path: Path) -> dict:
+        """Load cached per-file symbols, keyed by file name."""
+        try:
+            data = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != SYMBOL_CACHE_VERSION:
+            return {}
+        return data.get('files') or {}
+    
+    def _save_cache(self, cache_path: Path, entries: dict) -> None:
+        """Persist per-file symbols atomically (only once context/ exists)."""
+        if not cache_path.parent.is_dir():
+            return
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps({
+                "version": SYMBOL_CACHE_VERSION,
+                "files": entries
+            }, separators=(',', ':')))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
     def _parse_file(self, filepath: Path, file_type: str) -> FileSymbols:
         """Parse a single C file for symbols."""
         try:
-            content = filepath.read_text()
+            content = filepath.read_bytes()
         except Exception:
             return FileSymbols(
                 path=f"src/{filepath.name}",
@@ -318,163 +515,175 @@ class SymbolIndexGenerator:
                 lines=0
             )
         
-        lines = content.split('\n')
-        
-        return FileSymbols(
+        out = FileSymbols(
             path=f"src/{filepath.name}",
             file_type=file_type,
-            lines=len(lines),
-            includes=self._extract_includes(content),
-            structs=self._extract_structs(content),
-            functions=self._extract_functions(content, lines),
-            constants=self._extract_constants(content)
+            lines=0
         )
-    
-    def _extract_includes(self, content: str) -> list[str]:
-        """Extract #include directives."""
-        return self.INCLUDE_PATTERN.findall(content)
-    
-    def _extract_constants(self, content: str) -> list[ConstantSymbol]:
-        """Extract #define constants, filtering out noise."""
-        constants = []
-        
-        for i, line in enumerate(content.split('\n'), 1):
-            match = self.DEFINE_PATTERN.match(line)
-            if match:
-                name, value = match.groups()
+        self._visit(content, out)
+        return out
+    
+    def _visit(self, content: bytes, out: FileSymbols) -> None:
+        """Scan content once, appending each symbol to out as it is found."""
+        # Text-mode newline handling (CRLF and CR become LF)
+        if b'\r' in content:
+            content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        
+        newline_offsets = _newline_offsets(content)
+        out.lines = len(newline_offsets) + 1
+        
+        # Scan a copy with comments and literals blanked so neither produces
+        # symbols or calls; text that must keep its literals is sliced from
+        # content at the same offsets
+        code = _strip_noise(content)
+        
+        # Enums are listed after structs, and declarations only for names
+        # with no definition anywhere in the file, so both wait until the
+        # scan ends. The first definition or declaration of a name wins,
+        # even one skipped for its return type.
+        enums = []
+        defined = set()
+        declared = set()
+        declarations = []
+        
+        pos = 0
+        while True:
+            match = self.SYMBOL_PATTERN.search(code, pos)
+            if match is None:
+                break
+            pos = match.end()
+            
+            if match['include'] is not None:
+                include = _text(content[match.start('include'):match.end('include')])
+                out.includes.append(include)
+                out.include_basenames.append(include.strip('"<>').split("/")[-1])
+            elif match['define_name'] is not None:
+                name = _text(match['define_name'])
                 # Skip include guards, function-like macros, and tile indices
                 if (name.endswith('_H') or 
                     '(' in name or 
                     name.startswith('TILE_') or
                     name.startswith('_')):
                     continue
-                    
-                constants.append(ConstantSymbol(
+                
+                # Trailing comments are blank in code, so trim before slicing
+                value_start = match.start('define_value')
+                value = content[value_start:value_start + len(match['define_value'].rstrip())]
+                out.constants.append(ConstantSymbol(
                     name=name,
-                    value=value.strip()[:50],  # Truncate long values
-                    line=i
+                    value=_text(value).strip()[:50],  # Truncate long values
+                    line=_offset_to_line(newline_offsets, match.start())
                 ))
-        
-        return constants
-    
-    def _extract_structs(self, content: str) -> list[StructSymbol]:
-        """Extract struct and enum definitions."""
-        structs = []
-        
-        # Structs
-        for match in self.STRUCT_PATTERN.finditer(content):
-            body, name = match.groups()
-            fields = self._parse_struct_fields(body)
-            line = content[:match.start()].count('\n') + 1
-            structs.append(StructSymbol(
-                name=name,
-                kind="struct",
-                fields=fields,
-                line=line
-            ))
-        
-        # Enums
-        for match in self.ENUM_PATTERN.finditer(content):
-            body, name = match.groups()
-            # Extract enum values
-            values = [v.strip().split('=')[0].strip() 
-                     for v in body.split(',') if v.strip()]
-            values = [v for v in values if v and not v.startswith('//')]
-            line = content[:match.start()].count('\n') + 1
-            structs.append(StructSymbol(
-                name=name,
-                kind="enum",
-                fields=values[:10],  # Limit to first 10 values
-                line=line
-            ))
-        
-        return structs
-    
-    def _parse_struct_fields(self, body: str) -> list[str]:
-        """Extract field names from struct body."""
-        fields = []
-        field_pattern = re.compile(r'(\w+)\s*(?:\[[^\]]*\])?\s*;')
-        for match in field_pattern.finditer(body):
-            fields.append(match.group(1))
-        return fields
-    
-    def _extract_functions(self, content: str, lines: list[str]) -> list[FunctionSymbol]:
-        """Extract function declarations and definitions."""
-        functions = []
-        seen_names = set()
-        
-        # Function definitions (with body)
-        for match in self.FUNC_DEF_PATTERN.finditer(content):
-            ret_type, name, params = match.groups()
-            if name in seen_names:
-                continue
-            seen_names.add(name)
-            
-            # Skip if return type looks like a keyword/control statement
-            if ret_type.strip() in self.C_KEYWORDS:
-                continue
-            
-            line = content[:match.start()].count('\n') + 1
-            
-            # Extract function body to find calls
-            body = self._extract_function_body(content, match.end() - 1)
-            calls = self._extract_function_calls(body)
-            
-            functions.append(FunctionSymbol(
-                name=name,
-                return_type=ret_type.strip(),
-                params=params.strip(),
-                line=line,
-                is_definition=True,
-                calls=calls
-            ))
-        
-        # Function declarations (no body) - typically in headers
-        for match in self.FUNC_DECL_PATTERN.finditer(content):
-            ret_type, name, params = match.groups()
-            if name in seen_names:
-                continue
-            seen_names.add(name)
-            
-            if ret_type.strip() in self.C_KEYWORDS:
-                continue
-            
-            line = content[:match.start()].count('\n') + 1
-            functions.append(FunctionSymbol(
-                name=name,
-                return_type=ret_type.strip(),
-                params=params.strip(),
-                line=line,
-                is_definition=False
-            ))
-        
-        return functions
-    
-    def _extract_function_body(self, content: str, start_brace: int) -> str:
+            elif match['type_kind'] is not None:
+                # Skip past the whole definition, nested braces included
+                body_end = self._match_brace(code, pos - 1)
+                tail = self.TYPEDEF_NAME_PATTERN.match(code, body_end)
+                if tail is None:
+                    continue
+                pos = tail.end()
+                body = code[match.end():body_end - 1]
+                
+                if match['type_kind'] == b'struct':
+                    out.structs.append(StructSymbol(
+                        name=_text(tail[1]),
+                        kind="struct",
+                        fields=self._parse_struct_fields(body),
+                        line=_offset_to_line(newline_offsets, match.start())
+                    ))
+                    continue
+                
+                # Extract enum values
+                values = [v.strip().split('=')[0].strip() 
+                         for v in _text(body).split(',') if v.strip()]
+                values = [v for v in values if v and not v.startswith('//')]
+                enums.append(StructSymbol(
+                    name=_text(tail[1]),
+                    kind="enum",
+                    fields=values[:10],  # Limit to first 10 values
+                    line=_offset_to_line(newline_offsets, match.start())
+                ))
+            else:
+                # Interned so every call list naming it shares one string
+                name = sys.intern(_text(match['func_name']))
+                is_definition = match['term'] == b'{'
+                seen = defined if is_definition else declared
+                if name in seen:
+                    continue
+                seen.add(name)
+                
+                # Skip if return type looks like a keyword/control statement
+                ret_type = _text(match['ret_type']).strip()
+                if ret_type in self.C_KEYWORDS:
+                    continue
+                
+                func = FunctionSymbol(
+                    name=name,
+                    return_type=ret_type,
+                    params=_text(match['params']).strip(),
+                    line=_offset_to_line(newline_offsets, match.start()),
+                    is_definition=is_definition
+                )
+                if is_definition:
+                    # Extract function body to find calls
+                    body = self._extract_function_body(code, match.end() - 1)
+                    func.calls = self._extract_function_calls(body)
+                    out.functions.append(func)
+                else:
+                    declarations.append(func)
+        
+        out.structs.extend(enums)
+        out.functions.extend(f for f in declarations if f.name not in defined)
+    
+    def _parse_struct_fields(self, body: bytes) -> list[str]:
+        """Extract top-level field names from struct body."""
+        # Drop the bodies of nested structs/unions, keeping the member name
+        # that follows each one
+        parts = []
+        start = 0
+        brace = body.find(b'{')
+        while brace != -1:
+            parts.append(body[start:brace])
+            start = self._match_brace(body, brace)
+            brace = body.find(b'{', start)
+        parts.append(body[start:])
+        
+        return [_text(name) for name in self.FIELD_PATTERN.findall(b''.join(parts))]
+    
+    def _extract_function_body(self, content: bytes, start_brace: int) -> bytes:
         """Extract function body from opening brace to matching close."""
+        return content[start_brace:self._match_brace(content, start_brace)]
+    
+    def _match_brace(self, content: bytes, start_brace: int) -> int:
+        """Offset just past the brace matching the one at start_brace."""
         depth = 1
-        i = start_brace + 1
-        
-        while i < len(content) and depth > 0:
-            if content[i] == '{':
+        next_open = content.find(b'{', start_brace + 1)
+        next_close = content.find(b'}', start_brace + 1)
+        
+        # Jump brace to brace with find rather than stepping per character
+        while True:
+            if next_close == -1:
+                # Unbalanced braces run to the end of the file
+                end = len(content)
+                break
+            if next_open != -1 and next_open < next_close:
                 depth += 1
-            elif content[i] == '}':
+                next_open = content.find(b'{', next_open + 1)
+            else:
                 depth -= 1
-            i += 1
+                end = next_close + 1
+                if depth == 0:
+                    break
+                next_close = content.find(b'}', end)
         
-        return content[start_brace:i]
+        return end
     
-    def _extract_function_calls(self, body: str) -> list[str]:
+    def _extract_function_calls(self, body: bytes) -> list[str]:
         """Extract function calls from a function body."""
-        calls = set()
-        
-        for match in self.FUNC_CALL_PATTERN.finditer(body):
-            name = match.group(1)
-            # Filter out keywords and common non-function identifiers
-            if name not in self.C_KEYWORDS and not name.isupper():
-                calls.add(name)
-        
-        return sorted(calls)
+        # Filter each distinct name once rather than once per call site,
+        # dropping keywords and common non-function identifiers
+        names = {_text(name) for name in set(self.FUNC_CALL_PATTERN.findall(body))}
+        names -= self.C_KEYWORDS
+        return sorted(sys.intern(name) for name in names if not name.isupper())
     
     def _build_call_graph(self, files: dict[str, FileSymbols]) -> dict[str, CallGraphEntry]:
         """Build a call graph from parsed function symbols."""
@@ -489,15 +698,37 @@ class SymbolIndexGenerator:
                         calls=func.calls
                     )
         
-        # Second pass: build called_by relationships
+        # Second pass: build called_by relationships from a reverse map,
+        # assigning each callee's list once (calls are already deduplicated)
+        callers = defaultdict(list)
         for func_name, entry in call_graph.items():
             for called_func in entry.calls:
-                if called_func in call_graph:
-                    call_graph[called_func].called_by.append(func_name)
+                callers[called_func].append(func_name)
+        for func_name, entry in call_graph.items():
+            entry.called_by = callers.get(func_name, [])
         
         return call_graph
 
 
+def _parse_file_worker(job: tuple[str, str]) -> FileSymbols:
+    """Parse one (path, file_type) job; module-level so it pickles."""
+    path, file_type = job
+    return SymbolIndexGenerator()._parse_file(Path(path), file_type)
+
+
+def _parse_files(jobs: list[tuple[str, str]]) -> list[FileSymbols]:
+    """
+    Parse many (path, file_type) jobs, returning FileSymbols in job order.
+    
+    Parsing is CPU-bound regex work, so large batches are spread across
+    processes. Typical projects have a handful of files and parse inline.
+    """
+    if len(jobs) < PARALLEL_PARSE_MIN_FILES:
+        return [_parse_file_worker(job) for job in jobs]
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(_parse_file_worker, jobs, chunksize=8))
+
+
 def generate_symbol_index(project_path: Path) -> SymbolIndex:
     """Convenience function to generate symbol index for a project."""
     generator = SymbolIndexGenerator()
@@ -540,30 +771,35 @@ def symbols_to_prompt(symbols: dict) -> str:
     
     files = symbols.get("files", {})
     
-    # Group by type
-    headers = {p: f for p, f in files.items() if f.get("type") == "header"}
-    impls = {p: f for p, f in files.items() if f.get("type") == "implementation"}
+    # Group by type, sorting the paths once
+    headers = []
+    impls = []
+    for path in sorted(files):
+        info = files[path]
+        file_type = info.get("type")
+        if file_type == "header":
+            headers.append(_format_file_info(path, info))
+        elif file_type == "implementation":
+            impls.append(_format_file_info(path, info))
     
     # Headers
     if headers:
         lines.append("### Headers")
-        for path, info in sorted(headers.items()):
-            lines.append(_format_file_info(path, info))
+        lines.extend(headers)
         lines.append("")
     
     # Implementations
     if impls:
         lines.append("### Implementation Files")
-        for path, info in sorted(impls.items()):
-            lines.append(_format_file_info(path, info))
+        lines.extend(impls)
         lines.append("")
     
     # Call graph (abbreviated)
     call_graph = symbols.get("call_graph", {})
     if call_graph:
         lines.append("### Key Function Relationships")
-        for func, info in sorted(call_graph.items()):
-            calls = info.get("calls", [])
+        for func in sorted(call_graph):
+            calls = call_graph[func].get("calls", [])
             if calls:
                 calls_str = ", ".join(calls[:5])
                 if len(calls) > 5:
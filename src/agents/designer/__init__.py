@@ -9,13 +9,38 @@ The Designer agent is responsible for:
 5. Assembling minimal context package for Coder
 """
 
+import io
+import re
 import json
+import time
+import queue
+import sqlite3
+import hashlib
+import functools
+import threading
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-import anthropic
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 # Imports
 from ..context.schemas import ProjectSummary, FeatureSet
@@ -27,8 +52,217 @@ from ..project_api import get_api, ProjectAPI
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 SAMPLES_DIR = PROJECT_ROOT / "games" / "samples"
 
+# On-disk cache of gap analyses, keyed by model + prompt + summary + request
+ANALYSIS_CACHE_PATH = Path.home() / ".gb-llm" / "cache" / "designer.sqlite"
+ANALYSIS_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Threads used to read project source files concurrently
+SOURCE_READ_WORKERS = 32
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(value) -> bytes:
+    """Serialize value to compact UTF-8 JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+# Upper bound on the size of ContextPackage.to_prompt_context
+MAX_PROMPT_TOKENS = 100_000
+CHARS_PER_TOKEN = 4  # Estimate used when tiktoken isn't installed
+
+# Prompt section priorities; when over budget the highest tier goes first
+TIER_ESSENTIAL = 0
+TIER_EXISTING = 1
+TIER_MODIFICATIONS = 2
+TIER_KNOWN_ISSUES = 3
+
+_token_encoding = None
+
+
+def _count_tokens(text: str) -> int:
+    """Count (or, without tiktoken, estimate) the tokens in text."""
+    global _token_encoding
+    if not TIKTOKEN_AVAILABLE:
+        return len(text) // CHARS_PER_TOKEN
+    if _token_encoding is None:
+        _token_encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_token_encoding.encode(text, disallowed_special=()))
+
+
+def _fit_to_budget(text: str, marks: list[tuple[int, int]], max_tokens: int) -> str:
+    """
+    Drop whole sections of text, lowest priority first, until it fits max_tokens.
+    
+    Args:
+        text: The full prompt
+        marks: (tier, start offset) of each section, in order
+        max_tokens: Token budget
+    """
+    # A byte-level BPE never produces more tokens than there are UTF-8 bytes
+    if len(text.encode()) <= max_tokens:
+        return text
+    
+    bounds = [start for _, start in marks[1:]] + [len(text)]
+    sections = [(tier, text[start:end]) for (tier, start), end in zip(marks, bounds)]
+    counts = [_count_tokens(section) for _, section in sections]
+    total = sum(counts)
+    
+    keep = [True] * len(sections)
+    for tier in sorted({tier for tier, _ in sections if tier != TIER_ESSENTIAL}, reverse=True):
+        if total <= max_tokens:
+            break
+        for i, (section_tier, _) in enumerate(sections):
+            if section_tier == tier:
+                keep[i] = False
+                total -= counts[i]
+    
+    return "".join(section for (_, section), kept in zip(sections, keep) if kept)
+
+
+# A fenced JSON object in a model response
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Braces, and string literals (which may contain braces) to skip over
+_JSON_BRACE_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def _extract_first_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} in text, or None if there is none."""
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    for m in _JSON_BRACE_RE.finditer(text, start):
+        token = m.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:m.end()]
+    return None
+
+
+# Rendered prompt text (and summary digests), keyed by a digest of the
+# content they were built from. Cached values are shared, so callers copy
+# anything mutable before handing it out
+_RENDER_CACHE: dict[bytes, object] = {}
+_RENDER_CACHE_MAX = 64
+_RENDER_CACHE_LOCK = threading.Lock()
+
 
-@dataclass
+def _memo_render(kind: str, obj, render):
+    """
+    Return render(), reusing the result of an earlier call on identical content.
+    
+    obj is hashed through orjson, which serializes dataclasses directly, so
+    in-place edits to a summary or package produce a new key.
+    """
+    if not ORJSON_AVAILABLE:
+        return render()
+    try:
+        key = hashlib.blake2b(kind.encode() + orjson.dumps(obj), digest_size=16).digest()
+    except TypeError:
+        return render()
+    with _RENDER_CACHE_LOCK:
+        value = _RENDER_CACHE.get(key)
+    if value is None:
+        value = render()
+        with _RENDER_CACHE_LOCK:
+            if len(_RENDER_CACHE) >= _RENDER_CACHE_MAX:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _RENDER_CACHE[next(iter(_RENDER_CACHE))]
+            _RENDER_CACHE[key] = value
+    return value
+
+
+def _digest_file(f) -> tuple[str, dict]:
+    """Return a summary file's prompt line and its existing_files entry."""
+    func_names = [fn.name for fn in f.functions]
+    structs = [s.name for s in f.structs]
+    funcs_str = ", ".join(func_names[:5])
+    
+    if func_names and structs:
+        detail_str = f" (functions: {funcs_str}; structs: {', '.join(structs)})"
+    elif func_names:
+        detail_str = f" (functions: {funcs_str})"
+    elif structs:
+        detail_str = f" (structs: {', '.join(structs)})"
+    else:
+        detail_str = ""
+    
+    entry = {
+        "path": f.path,
+        "description": f.description,
+        "key_functions": func_names,
+        "funcs_str": funcs_str,
+        "structs": structs
+    }
+    return f"- {f.path}: {f.description}{detail_str}", entry
+
+
+class _ChunkReader:
+    """
+    Binary file-like reader over text chunks pushed from another thread.
+    
+    Everything before the first '{' is dropped, so ijson starts parsing at
+    the JSON object even when the model writes prose or a code fence first.
+    """
+    
+    def __init__(self):
+        self._chunks = queue.Queue()
+        self._pending = b""
+        self._in_json = False
+        self._closed = False
+    
+    def put(self, text: str):
+        self._chunks.put(text)
+    
+    def close(self):
+        self._chunks.put(None)
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._pending and not self._closed:
+            text = self._chunks.get()
+            if text is None:
+                self._closed = True
+                break
+            if not self._in_json:
+                start = text.find("{")
+                if start < 0:
+                    continue
+                text = text[start:]
+                self._in_json = True
+            self._pending = text.encode()
+        
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def _parse_streamed_object(reader: _ChunkReader) -> Optional[dict]:
+    """Build the first JSON object from reader, or None if it is malformed or truncated."""
+    builder = ijson.ObjectBuilder()
+    try:
+        for prefix, event, value in ijson.parse(reader, use_float=True):
+            builder.event(event, value)
+            if prefix == "" and event == "end_map":
+                # Stop here; whatever follows the object (a closing fence) is not JSON
+                return builder.value
+    except ijson.JSONError:
+        pass
+    return None
+
+
+@dataclass(slots=True)
 class FeatureGap:
     """A feature that needs to be implemented."""
     name: str
@@ -37,7 +271,7 @@ class FeatureGap:
     depends_on: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Modification:
     """A modification to an existing feature."""
     feature: str  # Name of existing feature to modify
@@ -45,7 +279,7 @@ class Modification:
     files: list[str] = field(default_factory=list)  # Files likely to be modified
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaChange:
     """Changes to the data schema for content-driven features."""
     add_tables: list[dict] = field(default_factory=list)  # New tables to add
@@ -54,7 +288,7 @@ class SchemaChange:
     remove_fields: list[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ImplementationStep:
     """A single step in the implementation plan - small enough for one LLM call."""
     order: int
@@ -65,7 +299,7 @@ class ImplementationStep:
     acceptance_criteria: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextPackage:
     """
     Assembled context for the Coder agent.
@@ -78,7 +312,7 @@ class ContextPackage:
     current_state: str  # scaffolded, compiles, runs, refined
     
     # What exists
-    existing_files: list[dict]  # [{path, description, key_functions}]
+    existing_files: list[dict]  # [{path, description, key_functions, funcs_str}]
     existing_features: list[str]
     existing_patterns: list[str]
     
@@ -99,76 +333,94 @@ class ContextPackage:
     
     def to_prompt_context(self) -> str:
         """Convert to a formatted string for LLM prompt."""
-        sections = []
+        return _memo_render("prompt", self, self._render_prompt_context)
+    
+    def _render_prompt_context(self) -> str:
+        """
+        Build the to_prompt_context text.
+        
+        Sections are tagged with a priority tier so that a prompt over
+        MAX_PROMPT_TOKENS can shed known issues, then modifications, then
+        the existing files/features listing.
+        """
+        buf = io.StringIO()
+        w = buf.write
+        marks = []
+        
+        def section(tier):
+            marks.append((tier, buf.tell()))
         
         # Project state
-        sections.append(f"## Project: {self.project_name}")
-        sections.append(f"Current state: {self.current_state}")
-        sections.append("")
+        section(TIER_ESSENTIAL)
+        w(f"## Project: {self.project_name}\n")
+        w(f"Current state: {self.current_state}\n\n")
         
         # Existing files
-        sections.append("## Existing Files")
+        section(TIER_EXISTING)
+        w("## Existing Files\n")
         for f in self.existing_files:
-            funcs = ", ".join(f.get("key_functions", [])[:5])
-            sections.append(f"- **{f['path']}**: {f.get('description', '')} [{funcs}]")
-        sections.append("")
+            # funcs_str is precomputed by the designer; packages built
+            # elsewhere may only have key_functions
+            funcs = f["funcs_str"] if "funcs_str" in f else ", ".join(f.get("key_functions", [])[:5])
+            w(f"- **{f['path']}**: {f.get('description', '')} [{funcs}]\n")
+        w("\n")
         
         # Existing features
         if self.existing_features:
-            sections.append("## Already Implemented Features")
-            sections.append(", ".join(self.existing_features))
-            sections.append("")
+            w("## Already Implemented Features\n")
+            w(f"{', '.join(self.existing_features)}\n\n")
         
         # User request
-        sections.append("## User Request")
-        sections.append(self.user_request)
-        sections.append("")
+        section(TIER_ESSENTIAL)
+        w(f"## User Request\n{self.user_request}\n\n")
         
         # Feature gaps
         if self.feature_gaps:
-            sections.append("## Features to Implement")
+            w("## Features to Implement\n")
             for gap in self.feature_gaps:
                 deps = f" (depends on: {', '.join(gap.depends_on)})" if gap.depends_on else ""
-                sections.append(f"- **{gap.name}** (complexity {gap.complexity}): {gap.description}{deps}")
-            sections.append("")
+                w(f"- **{gap.name}** (complexity {gap.complexity}): {gap.description}{deps}\n")
+            w("\n")
         
         # Modifications to existing features
         if self.modifications:
-            sections.append("## Modifications to Existing Features")
+            section(TIER_MODIFICATIONS)
+            w("## Modifications to Existing Features\n")
             for mod in self.modifications:
                 files = f" (files: {', '.join(mod.files)})" if mod.files else ""
-                sections.append(f"- **{mod.feature}**: {mod.change}{files}")
-            sections.append("")
+                w(f"- **{mod.feature}**: {mod.change}{files}\n")
+            w("\n")
         
         # Schema changes
         if self.schema_changes:
-            sections.append("## Data Schema Changes")
+            section(TIER_ESSENTIAL)
+            w("## Data Schema Changes\n")
             if self.schema_changes.add_tables:
-                sections.append("### New Tables")
-                for table in self.schema_changes.add_tables:
-                    sections.append(f"- **{table['name']}**: {table.get('description', '')}")
-                    for field_name, field_def in table.get('fields', {}).items():
-                        sections.append(f"  - {field_name}: {field_def['type']}")
+                w("### New Tables\n")
+                self._write_tables(w)
             if self.schema_changes.add_fields:
-                sections.append("### New Fields")
+                w("### New Fields\n")
                 for field_add in self.schema_changes.add_fields:
-                    sections.append(f"- {field_add['table']}.{field_add['name']}: {field_add['field']['type']}")
-            sections.append("")
+                    w(f"- {field_add['table']}.{field_add['name']}: {field_add['field']['type']}\n")
+            w("\n")
         
         # Known issues
         if self.known_issues:
-            sections.append("## Known Issues to Avoid")
-            for issue in self.known_issues:
-                sections.append(f"- {issue}")
-            sections.append("")
+            section(TIER_KNOWN_ISSUES)
+            w("## Known Issues to Avoid\n")
+            self._write_bullets(w, self.known_issues)
+            w("\n")
         
         # Constraints
         if self.constraints:
-            sections.append("## Constraints")
-            for c in self.constraints:
-                sections.append(f"- {c}")
+            section(TIER_ESSENTIAL)
+            w("## Constraints\n")
+            self._write_bullets(w, self.constraints)
+        
+        text = _fit_to_budget(buf.getvalue(), marks, MAX_PROMPT_TOKENS)
         
-        return "\n".join(sections)
+        # Every line above ends in a newline; the prompt itself does not
+        return text[:-1]
     
     def to_step_context(self, step: 'ImplementationStep') -> str:
         """
@@ -179,58 +431,67 @@ class ContextPackage:
         Args:
             step: The specific ImplementationStep to generate context for
         """
-        sections = []
+        return _memo_render("step", (self, step), lambda: self._render_step_context(step))
+    
+    def _render_step_context(self, step: 'ImplementationStep') -> str:
+        """Build the to_step_context text for one step."""
+        buf = io.StringIO()
+        w = buf.write
         
         # Project state (brief)
-        sections.append(f"## Project: {self.project_name}")
-        sections.append(f"Current state: {self.current_state}")
-        sections.append("")
+        w(f"## Project: {self.project_name}\n")
+        w(f"Current state: {self.current_state}\n\n")
         
         # Overall goal (brief context)
-        sections.append("## Overall Goal")
-        sections.append(self.user_request)
-        sections.append("")
+        w(f"## Overall Goal\n{self.user_request}\n\n")
         
         # Current step details (THE FOCUS)
         total_steps = len(self.implementation_steps)
-        sections.append(f"## Current Step: {step.order}/{total_steps} - {step.title}")
-        sections.append(f"**Description:** {step.description}")
-        sections.append(f"**Feature:** {step.feature}")
-        sections.append("")
+        w(f"## Current Step: {step.order}/{total_steps} - {step.title}\n")
+        w(f"**Description:** {step.description}\n")
+        w(f"**Feature:** {step.feature}\n\n")
         
         # Hard requirements for this step
         if step.hard_requirements:
-            sections.append("### MUST Follow These Rules")
-            for req in step.hard_requirements:
-                sections.append(f"- {req}")
-            sections.append("")
+            w("### MUST Follow These Rules\n")
+            self._write_bullets(w, step.hard_requirements)
+            w("\n")
         
         # Acceptance criteria
         if step.acceptance_criteria:
-            sections.append("### Acceptance Criteria")
-            for criterion in step.acceptance_criteria:
-                sections.append(f"- [ ] {criterion}")
-            sections.append("")
+            w("### Acceptance Criteria\n")
+            self._write_bullets(w, step.acceptance_criteria, "- [ ] ")
+            w("\n")
         
         # Schema changes (if relevant to this step)
         if self.schema_changes and step.order == 1:  # Usually step 1 handles data structures
-            sections.append("## Data Schema Changes")
+            w("## Data Schema Changes\n")
             if self.schema_changes.add_tables:
-                sections.append("### New Tables to Define")
-                for table in self.schema_changes.add_tables:
-                    sections.append(f"- **{table['name']}**: {table.get('description', '')}")
-                    for field_name, field_def in table.get('fields', {}).items():
-                        sections.append(f"  - {field_name}: {field_def['type']}")
-            sections.append("")
+                w("### New Tables to Define\n")
+                self._write_tables(w)
+            w("\n")
         
         # Known issues
         if self.known_issues:
-            sections.append("## Known Issues to Avoid")
-            for issue in self.known_issues:
-                sections.append(f"- {issue}")
-            sections.append("")
+            w("## Known Issues to Avoid\n")
+            self._write_bullets(w, self.known_issues)
+            w("\n")
         
-        return "\n".join(sections)
+        # Every line above ends in a newline; the prompt itself does not
+        return buf.getvalue()[:-1]
+    
+    @staticmethod
+    def _write_bullets(w, items: list, prefix: str = "- "):
+        """Write one bullet line per item."""
+        if items:
+            w("".join(f"{prefix}{item}\n" for item in items))
+    
+    def _write_tables(self, w):
+        """Write the new schema tables and their fields."""
+        for table in self.schema_changes.add_tables:
+            w(f"- **{table['name']}**: {table.get('description', '')}\n")
+            for field_name, field_def in table.get('fields', {}).items():
+                w(f"  - {field_name}: {field_def['type']}\n")
 
 
 # System prompt for the Designer agent
@@ -367,11 +628,26 @@ class DesignerAgent:
             verbose: Print debug information
             log_callback: Optional callback(level, message) for log messages
         """
+        # Imported here so that using the dataclasses alone doesn't load the SDK
+        import anthropic
         self.client = anthropic.Anthropic()
         self.model = model
         self.verbose = verbose
         self.log_callback = log_callback
         self.api = get_api()
+        
+        # Project directories by ID, so repeated file reads skip get_project
+        self._get_project_path = functools.lru_cache(maxsize=64)(self._load_project_path)
+        
+        # Conversation turns held back by assemble_context(flush=False)
+        self._pending_turns: list[tuple[str, dict]] = []
+    
+    def __enter__(self) -> 'DesignerAgent':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        # Write turns buffered by assemble_context(flush=False)
+        self.flush()
     
     def _log(self, level: str, message: str):
         """Log a message to console and callback."""
@@ -383,57 +659,150 @@ class DesignerAgent:
             except Exception:
                 pass
     
-    def _stream_message(self, system: str, prompt: str, max_tokens: int = 4096) -> dict:
+    def _stream_message(
+        self,
+        system: str,
+        prompt: str,
+        max_tokens: int = 4096,
+        parse_json: bool = False
+    ) -> dict:
         """
         Call Claude API with streaming to avoid timeout errors.
         
         Returns dict with 'text' (response content) and 'stop_reason'.
+        With parse_json (and ijson installed), the first JSON object in the
+        response is also parsed on a worker thread while it streams in, and
+        returned under 'json' (None if it could not be parsed).
         """
-        response_text = ""
+        chunks = []
         stop_reason = None
+        reader = None
+        parsed = None
+        if parse_json and IJSON_AVAILABLE:
+            reader = _ChunkReader()
+            pool = ThreadPoolExecutor(max_workers=1)
+            parsed = pool.submit(_parse_streamed_object, reader)
+        
+        try:
+            # The system prompt is a fixed prefix, so mark it for prompt caching
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    if reader:
+                        reader.put(text)
+                final_message = stream.get_final_message()
+                stop_reason = final_message.stop_reason
+                cached_tokens = getattr(final_message.usage, "cache_read_input_tokens", None)
+                if cached_tokens:
+                    self._log("info", f"   ♻️ {cached_tokens} prompt tokens read from cache")
+        finally:
+            if reader:
+                # End of input lets the parser thread finish before shutdown
+                reader.close()
+                pool.shutdown()
         
-        with self.client.messages.stream(
-            model=self.model,
-            max_tokens=max_tokens,
-            system=system,
-            messages=[{"role": "user", "content": prompt}]
-        ) as stream:
-            for text in stream.text_stream:
-                response_text += text
-            final_message = stream.get_final_message()
-            stop_reason = final_message.stop_reason
+        result = {"text": "".join(chunks), "stop_reason": stop_reason}
+        if parse_json:
+            result["json"] = parsed.result() if parsed else None
         
-        return {"text": response_text, "stop_reason": stop_reason}
+        return result
+    
+    def _cache_connect(self) -> sqlite3.Connection:
+        """Open the analysis cache, creating it if needed."""
+        ANALYSIS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(ANALYSIS_CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses "
+            "(key TEXT PRIMARY KEY, value BLOB, created REAL)"
+        )
+        return conn
+    
+    def _cache_get(self, key: str) -> Optional[dict]:
+        """Return a cached analysis, or None if missing, expired or unreadable."""
+        try:
+            conn = self._cache_connect()
+            try:
+                row = conn.execute(
+                    "SELECT value, created FROM analyses WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None or time.time() - row[1] > ANALYSIS_CACHE_TTL:
+                return None
+            return _json_loads(row[0])
+        except (sqlite3.Error, OSError, ValueError):
+            return None
+    
+    def _cache_put(self, key: str, value: dict):
+        """Store an analysis in the cache. Failures are ignored."""
+        try:
+            conn = self._cache_connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO analyses (key, value, created) VALUES (?, ?, ?)",
+                        (key, _json_dumps(value), time.time())
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError, TypeError):
+            pass
     
     def analyze_request(
         self,
         project_id: str,
-        user_request: str
+        user_request: str,
+        cache: bool = True,
+        summary: Optional[ProjectSummary] = None
     ) -> dict:
         """
         Analyze a user request against current project state.
         
+        Analyses are cached on disk, so repeating a request against an
+        unchanged summary skips the Claude call.
+        
         Args:
             project_id: The project to analyze
             user_request: What the user wants to do
+            cache: Use a cached analysis if one exists (False forces a refresh)
+            summary: The project's summary, if the caller already loaded it
             
         Returns:
             Analysis dict with gaps, modifications, etc.
         """
         # Load project summary
-        project = self.api.get_project(project_id)
-        summary = project.summary
-        
-        if not summary:
-            raise ValueError(f"Project {project_id} has no summary")
+        if summary is None:
+            project = self.api.get_project(project_id)
+            summary = project.summary
+            project_name = project.name
+            
+            if not summary:
+                raise ValueError(f"Project {project_id} has no summary")
+        else:
+            project_name = summary.project_name
         
-        self._log("info", f"📊 Project: {project.name}")
+        self._log("info", f"📊 Project: {project_name}")
         self._log("info", f"   State: {summary.current_state}")
-        self._log("info", f"   🤖 Calling Claude for gap analysis...")
         
         # Build prompt with summary context
         summary_context = self._format_summary_for_prompt(summary)
         
+        cache_key = hashlib.sha256(
+            "\0".join((self.model, DESIGNER_SYSTEM_PROMPT, summary_context, user_request)).encode()
+        ).hexdigest()
+        analysis = self._cache_get(cache_key) if cache else None
+        if analysis is not None:
+            self._log("info", f"   ♻️ Using cached gap analysis")
+            self._log_analysis(analysis)
+            return analysis
+        
+        self._log("info", f"   🤖 Calling Claude for gap analysis...")
+        
         user_message = f"""## Current Project State
 {summary_context}
 
@@ -443,21 +812,28 @@ class DesignerAgent:
 Analyze what needs to change to fulfill this request. Focus on MINIMAL changes - extend existing code where possible."""
 
         # Call Claude for gap analysis with streaming (avoids timeout errors)
-        response = self._stream_message(DESIGNER_SYSTEM_PROMPT, user_message)
+        response = self._stream_message(DESIGNER_SYSTEM_PROMPT, user_message, parse_json=True)
+        
+        # Parsed while streaming when possible
+        if response.get("json") is not None:
+            analysis = response["json"]
+            self._cache_put(cache_key, analysis)
+            self._log_analysis(analysis)
+            return analysis
         
         # Parse response
         response_text = response["text"]
         
         # Extract JSON
         try:
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0]
+            m = _JSON_BLOCK_RE.search(response_text)
+            if m:
+                json_str = m.group(1)
             else:
-                json_str = response_text
+                json_str = _extract_first_json_object(response_text) or response_text
             
-            analysis = json.loads(json_str)
+            analysis = _json_loads(json_str)
+            self._cache_put(cache_key, analysis)
         except json.JSONDecodeError as e:
             self._log("warning", f"   ⚠️ Failed to parse analysis JSON")
             analysis = {
@@ -466,7 +842,11 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
                 "warnings": [f"Could not parse analysis: {e}"]
             }
         
-        # Log what we found
+        self._log_analysis(analysis)
+        return analysis
+    
+    def _log_analysis(self, analysis: dict):
+        """Log the gaps, modifications and steps found by an analysis."""
         gaps = analysis.get('feature_gaps', [])
         mods = analysis.get('modifications', [])
         steps = analysis.get('implementation_steps', [])
@@ -480,11 +860,24 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
             self._log("info", f"   🔧 Found {len(mods)} modification(s)")
         if steps:
             self._log("info", f"   📝 {len(steps)} implementation step(s) planned")
-        
-        return analysis
     
     def _format_summary_for_prompt(self, summary: ProjectSummary) -> str:
         """Format project summary for the LLM prompt."""
+        return self._digest_summary(summary)[0]
+    
+    def _digest_summary(self, summary: ProjectSummary) -> tuple[str, list[dict], list[str]]:
+        """
+        Derive everything the designer needs from a summary in one pass.
+        
+        Returns (prompt text, existing_files entries, existing features).
+        The result is memoized by content, so analyze_request and
+        assemble_context share one walk over summary.files. The returned
+        lists and entries belong to the cache; copy them before use.
+        """
+        return _memo_render("summary", summary, lambda: self._build_summary_digest(summary))
+    
+    def _build_summary_digest(self, summary: ProjectSummary) -> tuple[str, list[dict], list[str]]:
+        """Build the _digest_summary result."""
         sections = []
         
         sections.append(f"**Project:** {summary.project_name}")
@@ -507,31 +900,35 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
         
         # Files
         sections.append("\n**Files:**")
-        for f in summary.files:
-            funcs = [fn.name for fn in f.functions][:5]
-            structs = [s.name for s in f.structs]
-            
-            details = []
-            if funcs:
-                details.append(f"functions: {', '.join(funcs)}")
-            if structs:
-                details.append(f"structs: {', '.join(structs)}")
-            
-            detail_str = f" ({'; '.join(details)})" if details else ""
-            sections.append(f"- {f.path}: {f.description}{detail_str}")
+        file_digests = [_digest_file(f) for f in summary.files]
+        if file_digests:
+            sections.append("\n".join(line for line, _ in file_digests))
+        existing_files = [entry for _, entry in file_digests]
         
         # Known issues
         if summary.known_issues:
             sections.append("\n**Known issues:**")
-            for issue in summary.known_issues:
-                sections.append(f"- [{issue.severity}] {issue.description}")
+            sections.append("\n".join(
+                f"- [{issue.severity}] {issue.description}" for issue in summary.known_issues
+            ))
         
-        return "\n".join(sections)
+        return "\n".join(sections), existing_files, all_features
+    
+    def flush(self):
+        """Write buffered conversation turns, one write per project."""
+        by_project: dict[str, list[dict]] = {}
+        for project_id, turn in self._pending_turns:
+            by_project.setdefault(project_id, []).append(turn)
+        self._pending_turns.clear()
+        
+        for project_id, turns in by_project.items():
+            self.api.add_conversation_turns(project_id, turns)
     
     def assemble_context(
         self,
         project_id: str,
-        user_request: str
+        user_request: str,
+        flush: bool = True
     ) -> ContextPackage:
         """
         Assemble a minimal context package for the Coder agent.
@@ -544,6 +941,9 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
         Args:
             project_id: The project to work on
             user_request: What the user wants
+            flush: Record the analysis in the conversation now. Pass False
+                when assembling many contexts, then call flush() once
+                (or use the agent as a context manager, which flushes on exit)
             
         Returns:
             ContextPackage with everything the Coder needs
@@ -556,7 +956,7 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
             raise ValueError(f"Project {project_id} has no summary")
         
         # Analyze request
-        analysis = self.analyze_request(project_id, user_request)
+        analysis = self.analyze_request(project_id, user_request, summary=summary)
         
         # Build feature gaps
         feature_gaps = []
@@ -607,21 +1007,9 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
         # Sort steps by order
         implementation_steps.sort(key=lambda s: s.order)
         
-        # Build existing files info
-        existing_files = []
-        for f in summary.files:
-            existing_files.append({
-                "path": f.path,
-                "description": f.description,
-                "key_functions": [fn.name for fn in f.functions],
-                "structs": [s.name for s in f.structs]
-            })
-        
-        # Build existing features
-        existing_features = (
-            summary.features.from_template +
-            summary.features.added
-        )
+        # Existing files info and features, from the same pass over the
+        # summary that built the analysis prompt
+        _, existing_files, existing_features = self._digest_summary(summary)
         
         # Build known issues
         known_issues = [
@@ -644,11 +1032,11 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
         
         # Record this in conversation
         schema_change_count = len(schema_changes.add_tables) + len(schema_changes.add_fields) if schema_changes else 0
-        self.api.add_conversation_turn(
-            project_id=project_id,
-            role="system",
-            content=f"Designer analyzed request: {len(feature_gaps)} gaps, {len(modifications)} modifications, {schema_change_count} schema changes, {len(implementation_steps)} steps",
-            metadata={
+        self._pending_turns.append((project_id, {
+            "role": "system",
+            "content": f"Designer analyzed request: {len(feature_gaps)} gaps, {len(modifications)} modifications, {schema_change_count} schema changes, {len(implementation_steps)} steps",
+            "timestamp": datetime.now().isoformat(),
+            "metadata": {
                 "agent": "designer",
                 "action": "analyze",
                 "gaps": [g.name for g in feature_gaps],
@@ -657,14 +1045,19 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
                 "implementation_steps": len(implementation_steps),
                 "step_titles": [s.title for s in implementation_steps]
             }
-        )
+        }))
+        if flush:
+            self.flush()
         
         return ContextPackage(
             project_id=project_id,
             project_name=summary.project_name,
             current_state=summary.current_state,
-            existing_files=existing_files,
-            existing_features=existing_features,
+            existing_files=[
+                {**entry, "key_functions": list(entry["key_functions"]), "structs": list(entry["structs"])}
+                for entry in existing_files
+            ],
+            existing_features=list(existing_features),
             existing_patterns=summary.patterns,
             user_request=user_request,
             feature_gaps=feature_gaps,
@@ -675,6 +1068,10 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
             constraints=constraints
         )
     
+    def _load_project_path(self, project_id: str) -> Path:
+        """Look up a project's directory."""
+        return self.api.get_project(project_id).path
+    
     def get_relevant_source_files(
         self,
         project_id: str,
@@ -690,16 +1087,26 @@ Analyze what needs to change to fulfill this request. Focus on MINIMAL changes -
         Returns:
             Dict mapping path to file content
         """
-        project = self.api.get_project(project_id)
-        project_path = project.path
+        project_path = self._get_project_path(project_id)
+        if not project_path.is_dir():
+            # Moved or deleted since it was cached; look it up again
+            self._get_project_path.cache_clear()
+            project_path = self._get_project_path(project_id)
+        
+        def read_one(rel_path: str) -> tuple[str, Optional[str]]:
+            try:
+                return rel_path, (project_path / rel_path).read_text()
+            except (FileNotFoundError, IsADirectoryError, PermissionError):
+                return rel_path, None
         
-        contents = {}
-        for rel_path in file_paths:
-            full_path = project_path / rel_path
-            if full_path.exists():
-                contents[rel_path] = full_path.read_text()
+        if len(file_paths) < 2:
+            results = map(read_one, file_paths)
+        else:
+            # Overlap the blocking reads; results come back in request order
+            with ThreadPoolExecutor(max_workers=min(SOURCE_READ_WORKERS, len(file_paths))) as pool:
+                results = list(pool.map(read_one, file_paths))
         
-        return contents
+        return {rel_path: content for rel_path, content in results if content is not None}
 
 
 def create_designer(
@@ -11,6 +11,7 @@ This agent uses the corpus as context and Claude to reason about:
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -31,6 +32,10 @@ from corpus_search import (
 from plan_schema import ImplementationPlan, ImplementationStep, CodeReference
 
 
+# Maximum number of vector searches in flight at once
+VECTOR_SEARCH_WORKERS = 10
+
+
 # System prompt for the planning agent
 SYSTEM_PROMPT = """You are an expert GameBoy game developer and technical architect. Your role is to analyze game descriptions and create detailed implementation plans for GBDK-2020 (C-based GameBoy development).
 
@@ -219,6 +224,7 @@ class LLMPlanner:
         if use_vector_search and VECTOR_SEARCH_AVAILABLE:
             try:
                 self.corpus_search = CorpusSearch()
+                self.corpus_search.warmup()
                 if self.verbose:
                     stats = self.corpus_search.get_stats()
                     print(f"[LLM Planner] Vector search enabled ({stats['total']} indexed chunks)")
@@ -617,58 +623,75 @@ Return a fix plan as a JSON object following the specified format."""
         This adds actual code examples to each step's context_code field,
         so the coder has concrete examples to reference.
         """
-        if not self.corpus_search:
+        if not self.corpus_search or not plan.steps:
+            return
+        
+        # Build a search query from each step's info
+        search_queries = [f"{step.title} {step.description} {step.feature}" for step in plan.steps]
+        
+        try:
+            # Search for relevant functions for every step in one round trip
+            func_results_per_step = self.corpus_search.search_functions_batch(
+                search_queries, n_results=2, rerank_candidates=20
+            )
+        except Exception as e:
+            if self.verbose:
+                print(f"[LLM Planner] Vector search error: {e}")
             return
         
-        for step in plan.steps:
-            # Build a search query from the step's info
-            search_query = f"{step.title} {step.description} {step.feature}"
+        # Search for sprites for the steps that seem sprite-related, running
+        # the searches concurrently rather than one step after another
+        sprite_keywords = ['sprite', 'player', 'enemy', 'character', 'animation', 'tile', 'visual']
+        sprite_queries = [
+            query if any(kw in query.lower() for kw in sprite_keywords) else None
+            for query in search_queries
+        ]
+        sprite_futures = [None] * len(sprite_queries)
+        
+        with ThreadPoolExecutor(max_workers=VECTOR_SEARCH_WORKERS) as pool:
+            for i, query in enumerate(sprite_queries):
+                if query is not None:
+                    sprite_futures[i] = pool.submit(self.corpus_search.search_sprites, query, n_results=2)
             
-            try:
-                # Search for relevant functions
-                func_results = self.corpus_search.search_functions(search_query, n_results=2)
-                
-                # Search for sprites if the step seems sprite-related
-                sprite_keywords = ['sprite', 'player', 'enemy', 'character', 'animation', 'tile', 'visual']
-                if any(kw in search_query.lower() for kw in sprite_keywords):
-                    sprite_results = self.corpus_search.search_sprites(search_query, n_results=2)
-                else:
-                    sprite_results = []
-                
-                # Build context_code list
-                context_code = []
-                
-                for result in func_results:
-                    context_code.append({
-                        'type': 'function',
-                        'name': result.name,
-                        'sample_id': result.sample_id,
-                        'file': result.file,
-                        'code': result.code,
-                        'description': result.description,
-                        'relevance': result.relevance,
-                    })
-                
-                for result in sprite_results:
-                    context_code.append({
-                        'type': 'sprite',
-                        'name': result.name,
-                        'sample_id': result.sample_id,
-                        'file': result.file,
-                        'code': result.code,
-                        'description': result.description,
-                        'relevance': result.relevance,
-                        'ascii_preview': result.metadata.get('ascii_preview', ''),
-                    })
-                
-                step.context_code = context_code
-                
-                if self.verbose and context_code:
-                    print(f"[LLM Planner] Step {step.order}: Added {len(context_code)} code examples from vector search")
-                    
-            except Exception as e:
-                if self.verbose:
-                    print(f"[LLM Planner] Vector search error for step {step.order}: {e}")
+            for step, func_results, sprite_future in zip(plan.steps, func_results_per_step, sprite_futures):
+                try:
+                    self._attach_context_code(step, func_results, sprite_future.result() if sprite_future else [])
+                except Exception as e:
+                    if self.verbose:
+                        print(f"[LLM Planner] Vector search error for step {step.order}: {e}")
+    
+    def _attach_context_code(self, step: ImplementationStep, func_results: list, sprite_results: list) -> None:
+        """Store vector search results on a step as its context_code."""
+        # Build context_code list
+        context_code = []
+        
+        for result in func_results:
+            context_code.append({
+                'type': 'function',
+                'name': result.name,
+                'sample_id': result.sample_id,
+                'file': result.file,
+                'code': result.code,
+                'description': result.description,
+                'relevance': result.relevance,
+            })
+        
+        for result in sprite_results:
+            context_code.append({
+                'type': 'sprite',
+                'name': result.name,
+                'sample_id': result.sample_id,
+                'file': result.file,
+                'code': result.code,
+                'description': result.description,
+                'relevance': result.relevance,
+                'ascii_preview': result.metadata.get('ascii_preview', ''),
+            })
+        
+        step.context_code = context_code
+        
+        if self.verbose and context_code:
+            print(f"[LLM Planner] Step {step.order}: Added {len(context_code)} code examples from vector search")
     
     def _find_reference(self, sample_id: str, feature: str) -> Optional[CodeReference]:
         """Find a code reference from a sample for a feature."""
@@ -1012,6 +1012,27 @@ void game_render(void) {
         Returns:
             The created ConversationTurn
         """
+        return self.add_conversation_turns(
+            project_id,
+            [{"role": role, "content": content, "metadata": metadata}]
+        )[0]
+    
+    def add_conversation_turns(
+        self,
+        project_id: str,
+        turns: list[dict]
+    ) -> list[ConversationTurn]:
+        """
+        Add several turns to the conversation history with a single write.
+        
+        Args:
+            project_id: The project's UUID
+            turns: Dicts with "role", "content" and optionally "metadata"
+                and "timestamp" (defaults to now)
+            
+        Returns:
+            The created ConversationTurns, in order
+        """
         project_path = PROJECTS_DIR / project_id
         conversation_path = project_path / "context" / "conversation.json"
         
@@ -1026,17 +1047,20 @@ void game_render(void) {
         else:
             conv_data = json.loads(conversation_path.read_text())
         
-        turn = ConversationTurn(
-            role=role,
-            content=content,
-            timestamp=datetime.now().isoformat(),
-            metadata=metadata or {}
-        )
+        created = []
+        for t in turns:
+            turn = ConversationTurn(
+                role=t["role"],
+                content=t["content"],
+                timestamp=t.get("timestamp") or datetime.now().isoformat(),
+                metadata=t.get("metadata") or {}
+            )
+            conv_data["turns"].append(asdict(turn))
+            created.append(turn)
         
-        conv_data["turns"].append(asdict(turn))
         conversation_path.write_text(json.dumps(conv_data, indent=2))
         
-        return turn
+        return created
     
     def update_status(self, project_id: str, status: str, error: Optional[str] = None):
         """Update project status."""
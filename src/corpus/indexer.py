@@ -62,6 +62,9 @@ class SimpleVectorStore:
         self.embeddings: Optional[np.ndarray] = None
         self.ids: List[str] = []
         
+        # Row-normalized copy of embeddings, built on first search
+        self._embeddings_norm: Optional[np.ndarray] = None
+        
         self._load()
     
     def _load(self):
@@ -97,6 +100,7 @@ class SimpleVectorStore:
         
         # Update embeddings array
         emb_array = np.array(embedding, dtype=np.float32)
+        self._embeddings_norm = None
         
         if id in self.ids:
             # Update existing
@@ -110,6 +114,17 @@ class SimpleVectorStore:
             else:
                 self.embeddings = np.vstack([self.embeddings, emb_array])
     
+    def _normalized_embeddings(self) -> np.ndarray:
+        """Return the row-normalized embeddings, computing them once."""
+        if self._embeddings_norm is None:
+            self._embeddings_norm = self.embeddings / (np.linalg.norm(self.embeddings, axis=1, keepdims=True) + 1e-8)
+        return self._embeddings_norm
+    
+    def warmup(self):
+        """Prepare the store for searching, so the first query isn't slower."""
+        if self.embeddings is not None and len(self.embeddings) > 0:
+            self._normalized_embeddings()
+    
     def search(self, query_embedding: List[float], n_results: int = 5, 
                filter_fn: Optional[callable] = None) -> List[Dict]:
         """
@@ -131,7 +146,7 @@ class SimpleVectorStore:
         # Compute cosine similarities
         # Normalize vectors
         query_norm = query / (np.linalg.norm(query) + 1e-8)
-        embeddings_norm = self.embeddings / (np.linalg.norm(self.embeddings, axis=1, keepdims=True) + 1e-8)
+        embeddings_norm = self._normalized_embeddings()
         
         similarities = np.dot(embeddings_norm, query_norm)
         
@@ -164,6 +179,46 @@ class SimpleVectorStore:
         
         return results
     
+    def search_batch(self, query_embeddings: List[List[float]], 
+                     n_results: int = 5) -> List[List[Dict]]:
+        """
+        Search for several query vectors with one similarity matrix product.
+        
+        Args:
+            query_embeddings: Query vectors
+            n_results: Number of results to return per query
+            
+        Returns:
+            One list of {id, text, metadata, similarity} dicts per query
+        """
+        if self.embeddings is None or len(self.embeddings) == 0:
+            return [[] for _ in query_embeddings]
+        
+        queries = np.array(query_embeddings, dtype=np.float32)
+        
+        # Cosine similarities of every document against every query
+        queries_norm = queries / (np.linalg.norm(queries, axis=1, keepdims=True) + 1e-8)
+        embeddings_norm = self._normalized_embeddings()
+        
+        similarities = np.dot(embeddings_norm, queries_norm.T)
+        
+        all_results = []
+        for q in range(similarities.shape[1]):
+            column = similarities[:, q]
+            results = []
+            for idx in np.argsort(column)[::-1][:n_results]:
+                id = self.ids[idx]
+                doc = self.documents[id]
+                results.append({
+                    'id': id,
+                    'text': doc['text'],
+                    'metadata': doc['metadata'],
+                    'similarity': float(column[idx])
+                })
+            all_results.append(results)
+        
+        return all_results
+    
     def count(self) -> int:
         """Return number of documents."""
         return len(self.documents)
@@ -172,6 +227,7 @@ class SimpleVectorStore:
         """Clear all documents."""
         self.documents = {}
         self.embeddings = None
+        self._embeddings_norm = None
         self.ids = []
         self._save()
     
@@ -5,6 +5,7 @@ Provides semantic search over indexed code samples using a simple
 JSON + numpy vector store with OpenAI embeddings.
 """
 
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Literal
 from dataclasses import dataclass
@@ -20,12 +21,76 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+try:
+    from sentence_transformers import CrossEncoder
+    RERANK_AVAILABLE = True
+except ImportError:
+    RERANK_AVAILABLE = False
+
 from .indexer import SimpleVectorStore, EMBEDDING_MODEL
 
 
 # Paths
 DB_PATH = PROJECT_ROOT / "games" / "corpus_db"
 
+# Total characters of example code in a get_context_for_task result
+CONTEXT_CODE_BUDGET = 6000
+
+# Examples cut below this many characters are dropped if also low relevance
+MIN_EXAMPLE_CHARS = 200
+LOW_RELEVANCE = 0.5
+
+# Query embeddings kept per CorpusSearch, so repeated queries skip the API
+QUERY_EMBEDDING_CACHE_MAX = 1024
+
+
+# Cross-encoder used to rerank a wide vector recall (if installed)
+RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RERANK_TEXT_CHARS = 1000  # Code characters shown to the reranker per candidate
+
+_reranker = None
+_reranker_lock = threading.Lock()
+
+
+def _get_reranker():
+    """Load the shared cross-encoder on first use."""
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = CrossEncoder(RERANK_MODEL)
+    return _reranker
+
+
+def _query_key(text: str) -> str:
+    """Normalize a query so case and spacing variants share one embedding."""
+    return " ".join(text.lower().split())
+
+
+def _allocate_code_budget(lengths: List[int], weights: List[float], total_chars: int) -> List[int]:
+    """
+    Split total_chars across code snippets in proportion to their weights.
+    
+    Snippets shorter than their share keep their full length, and the
+    unused part of their share is redistributed over the rest.
+    
+    Returns:
+        Character limit for each snippet, in input order
+    """
+    weights = [max(w, 1e-6) for w in weights]
+    limits = [0] * len(lengths)
+    remaining_chars = total_chars
+    remaining_weight = sum(weights)
+    
+    # Snippets needing the least per unit of weight are settled first
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i] / weights[i]):
+        share = int(remaining_chars * weights[i] / remaining_weight)
+        limits[i] = min(lengths[i], share)
+        remaining_chars -= limits[i]
+        remaining_weight -= weights[i]
+    
+    return limits
+
 
 @dataclass
 class SearchResult:
@@ -72,6 +137,11 @@ class CorpusSearch:
         # Initialize OpenAI client
         self.openai = openai.OpenAI()
         
+        # Query embeddings by normalized query text. Searches run from
+        # several threads (e.g. the planner's parallel step lookups)
+        self._query_embeddings: Dict[str, List[float]] = {}
+        self._query_embeddings_lock = threading.Lock()
+        
         # Load stores
         self.stores = {}
         for name in ['functions', 'sprites', 'structs', 'constants']:
@@ -79,13 +149,54 @@ class CorpusSearch:
             if store_path.exists():
                 self.stores[name] = SimpleVectorStore(store_path)
     
+    def warmup(self):
+        """
+        Prepare every store for searching.
+        
+        Search normalizes each store's embedding matrix once and reuses it,
+        so doing that up front moves the cost out of the first query.
+        """
+        for store in self.stores.values():
+            store.warmup()
+    
     def _get_embedding(self, text: str) -> List[float]:
         """Get embedding for query text."""
-        response = self.openai.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text
-        )
-        return response.data[0].embedding
+        return self._get_embeddings([text])[0]
+    
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several query texts in one API call.
+        
+        Duplicate queries and queries seen before are only embedded once.
+        """
+        keys = [_query_key(text) for text in texts]
+        
+        embeddings = {}
+        uncached = {}
+        with self._query_embeddings_lock:
+            for key, text in zip(keys, texts):
+                if key in embeddings or key in uncached:
+                    continue
+                cached = self._query_embeddings.get(key)
+                if cached is not None:
+                    embeddings[key] = cached
+                else:
+                    uncached[key] = text
+        
+        if uncached:
+            response = self.openai.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=list(uncached.values())
+            )
+            with self._query_embeddings_lock:
+                for key, emb_data in zip(uncached, response.data):
+                    embeddings[key] = emb_data.embedding
+                    if len(self._query_embeddings) >= QUERY_EMBEDDING_CACHE_MAX:
+                        # Evict the oldest entry (dicts keep insertion order)
+                        del self._query_embeddings[next(iter(self._query_embeddings))]
+                    self._query_embeddings[key] = emb_data.embedding
+        
+        return [embeddings[key] for key in keys]
     
     def _format_results(self, results: List[Dict], collection_name: str) -> List[SearchResult]:
         """Convert store results to SearchResult objects."""
@@ -146,6 +257,64 @@ class CorpusSearch:
         results = store.search(query_embedding, n_results, filter_fn)
         return self._format_results(results, 'functions')
     
+    def search_functions_batch(self,
+                               queries: List[str],
+                               n_results: int = 5,
+                               rerank_candidates: int = 0) -> List[List[SearchResult]]:
+        """
+        Search for function implementations for several queries at once.
+        
+        All queries are embedded in a single API call and scored against
+        the store in a single pass, instead of one round trip per query.
+        
+        Args:
+            queries: Natural language descriptions, one per search
+            n_results: Maximum results to return per query
+            rerank_candidates: If set and a cross-encoder is installed, recall
+                this many candidates per query and keep the n_results the
+                cross-encoder scores highest
+            
+        Returns:
+            One list of SearchResult objects per query, in query order
+        """
+        store = self.stores.get('functions')
+        if not store or not queries:
+            return [[] for _ in queries]
+        
+        rerank = RERANK_AVAILABLE and rerank_candidates > n_results
+        
+        embeddings = self._get_embeddings(queries)
+        results = store.search_batch(embeddings, rerank_candidates if rerank else n_results)
+        formatted = [self._format_results(query_results, 'functions') for query_results in results]
+        
+        if rerank:
+            formatted = [
+                self._rerank(query, candidates)[:n_results]
+                for query, candidates in zip(queries, formatted)
+            ]
+        return formatted
+    
+    def _rerank(self, query: str, candidates: List[SearchResult]) -> List[SearchResult]:
+        """
+        Reorder candidates by cross-encoder relevance to the query.
+        
+        Candidates with the same sample, file and name are collapsed first.
+        """
+        unique = {}
+        for r in candidates:
+            unique.setdefault((r.sample_id, r.file, r.name), r)
+        candidates = list(unique.values())
+        
+        if len(candidates) < 2:
+            return candidates
+        
+        scores = _get_reranker().predict([
+            (query, f"{r.name}: {r.description}\n{r.code[:RERANK_TEXT_CHARS]}")
+            for r in candidates
+        ])
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in order]
+    
     def search_sprites(self,
                        query: str,
                        n_results: int = 5,
@@ -277,7 +446,8 @@ class CorpusSearch:
     
     def get_context_for_task(self, 
                              description: str,
-                             max_results: int = 10) -> str:
+                             max_results: int = 10,
+                             code_budget: int = CONTEXT_CODE_BUDGET) -> str:
         """
         Get relevant code context for a task description.
         
@@ -287,6 +457,8 @@ class CorpusSearch:
         Args:
             description: Task or game description
             max_results: Total max results across all types
+            code_budget: Total characters of example code, shared between
+                the results in proportion to their relevance
             
         Returns:
             Formatted context string with relevant code examples
@@ -296,24 +468,30 @@ class CorpusSearch:
         # Determine what types of code might be relevant
         desc_lower = description.lower()
         
-        search_types = []
+        # Every search uses the same query, so each chunk type is searched
+        # once, for the largest result count any matching topic asks for
+        search_types = {}
+        def want(chunk_type, n):
+            search_types[chunk_type] = max(n, search_types.get(chunk_type, 0))
+        
         if any(w in desc_lower for w in ['sprite', 'character', 'player', 'enemy', 'animation', 'visual']):
-            search_types.append(('sprites', 4))
+            want('sprites', 4)
         if any(w in desc_lower for w in ['collision', 'hit', 'overlap', 'touch']):
-            search_types.append(('functions', 3))
+            want('functions', 3)
         if any(w in desc_lower for w in ['move', 'jump', 'physics', 'gravity', 'velocity']):
-            search_types.append(('functions', 3))
+            want('functions', 3)
         if any(w in desc_lower for w in ['input', 'button', 'control']):
-            search_types.append(('functions', 2))
+            want('functions', 2)
         if any(w in desc_lower for w in ['state', 'data', 'struct']):
-            search_types.append(('structs', 2))
+            want('structs', 2)
         
         # Default to functions if nothing specific
         if not search_types:
-            search_types = [('functions', 5)]
+            search_types = {'functions': 5}
         
-        # Search and format results
-        for chunk_type, n in search_types:
+        # Search
+        searches = []
+        for chunk_type, n in search_types.items():
             if chunk_type == 'functions':
                 results = self.search_functions(description, n)
             elif chunk_type == 'sprites':
@@ -322,11 +500,29 @@ class CorpusSearch:
                 results = self.search_structs(description, n)
             else:
                 continue
+            searches.append((chunk_type, results))
+        
+        # Share the code budget across every result by relevance
+        all_results = [r for _, results in searches for r in results]
+        limits = _allocate_code_budget(
+            [len(r.code) for r in all_results],
+            [r.relevance for r in all_results],
+            code_budget
+        )
+        code_limits = {id(r): limit for r, limit in zip(all_results, limits)}
+        
+        # Format results
+        for chunk_type, results in searches:
+            kept = [
+                r for r in results
+                if code_limits[id(r)] >= min(len(r.code), MIN_EXAMPLE_CHARS)
+                or r.relevance >= LOW_RELEVANCE
+            ]
             
-            if results:
+            if kept:
                 parts.append(f"\n## Relevant {chunk_type.title()}\n")
                 
-                for r in results:
+                for r in kept:
                     parts.append(f"### {r.name} (from {r.sample_id})")
                     parts.append(f"*Relevance: {r.relevance:.2f}*\n")
                     
@@ -334,10 +530,11 @@ class CorpusSearch:
                         parts.append("Preview:")
                         parts.append(f"```\n{r.metadata['ascii_preview']}\n```")
                     
-                    # Truncate code if too long
+                    # Truncate code to its share of the budget
                     code = r.code
-                    if len(code) > 1500:
-                        code = code[:1500] + "\n// ... truncated"
+                    limit = code_limits[id(r)]
+                    if len(code) > limit:
+                        code = code[:limit] + "\n// ... truncated"
                     
                     parts.append(f"```c\n{code}\n```\n")
         